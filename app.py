@@ -6,11 +6,17 @@ Uses FastMCP PythonStdioTransport for proper client-server separation.
 Works with the unified server architecture for both local and cloud deployments.
 """
 
+import os
+import json
+import hashlib
+import threading
 import streamlit as st
 import requests
 import asyncio
-from typing import List, Dict
-from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+from collections import OrderedDict
+from datetime import date
+from dotenv import load_dotenv
 
 # Import our modules
 from ui_config import STREAMLIT_STYLE, TOOLS_HELP_TEXT, get_system_prompt
@@ -27,6 +33,122 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+load_dotenv()
+
+OLLAMA_BASE_URL = "http://localhost:11434"
+
+def _parse_keep_alive(value: str):
+    """Ollama takes a duration string ("30m") or a number of seconds (-1 keeps the model loaded)"""
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+# How long Ollama keeps the model in memory after a request (Ollama's own default is 5m)
+OLLAMA_KEEP_ALIVE = _parse_keep_alive(os.getenv("OLLAMA_KEEP_ALIVE", "30m"))
+
+# (connect, read) timeouts for chat requests; the read timeout bounds the wait between stream chunks
+OLLAMA_TIMEOUT = (5, 60)
+
+# Window of user/assistant exchanges; older messages are folded into a running summary
+# one window at a time and at most two windows are sent verbatim (full history stays in the UI)
+MAX_HISTORY_TURNS = max(1, int(os.getenv("MAX_HISTORY_TURNS", "6")))
+
+@st.cache_resource
+def get_ollama_session() -> requests.Session:
+    """Shared keep-alive HTTP session for Ollama, reused across turns and Streamlit reruns"""
+    session = requests.Session()
+    session.mount("http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=10))
+    return session
+
+def post_ollama_chat(request_data: Dict) -> requests.Response:
+    """Send a request to Ollama's /api/chat over the pooled session.
+    
+    Always streams - Ollama's non-streaming path can be far slower on some builds.
+    Use read_ollama_chat() to assemble the body of a successful response.
+    """
+    return get_ollama_session().post(
+        f"{OLLAMA_BASE_URL}/api/chat",
+        json={"keep_alive": OLLAMA_KEEP_ALIVE, **request_data, "stream": True},
+        timeout=OLLAMA_TIMEOUT,
+        stream=True
+    )
+
+def read_ollama_chat(response: requests.Response) -> Dict:
+    """Accumulate a streamed /api/chat response into the non-streaming response shape"""
+    content_parts = []
+    tool_calls = []
+    # Closing hands the pooled connection back even when the stream ends in an error
+    with response:
+        for line in response.iter_lines():
+            if not line:
+                continue
+            chunk = json.loads(line)
+            if "error" in chunk:
+                raise RuntimeError(chunk["error"])
+            message = chunk.get("message", {})
+            if message.get("content"):
+                content_parts.append(message["content"])
+            if message.get("tool_calls"):
+                tool_calls.extend(message["tool_calls"])
+    
+    message = {"role": "assistant", "content": "".join(content_parts)}
+    if tool_calls:
+        message["tool_calls"] = tool_calls
+    return {"message": message}
+
+RESPONSE_CACHE_SIZE = 256
+
+@st.cache_resource
+def get_response_cache() -> Tuple[OrderedDict, threading.Lock]:
+    """LRU of tool-free chat replies keyed by request hash, and the lock guarding it.
+    
+    Both are shared across Streamlit reruns and sessions; a lock created in the script body
+    would be recreated on every rerun and guard nothing.
+    """
+    return OrderedDict(), threading.Lock()
+
+def _response_cache_key(request_data: Dict) -> str:
+    """Stable hash of the model and messages of a chat request"""
+    payload = json.dumps(
+        {"model": request_data["model"], "messages": request_data["messages"]},
+        sort_keys=True
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+def get_cached_response(cache_key: str) -> Optional[str]:
+    """Return a cached reply and mark it most recently used"""
+    response_cache, lock = get_response_cache()
+    with lock:
+        content = response_cache.get(cache_key)
+        if content is not None:
+            response_cache.move_to_end(cache_key)
+    return content
+
+def cache_response(cache_key: str, content: str) -> None:
+    """Store a reply, evicting the least recently used one when full"""
+    response_cache, lock = get_response_cache()
+    with lock:
+        response_cache[cache_key] = content
+        response_cache.move_to_end(cache_key)
+        if len(response_cache) > RESPONSE_CACHE_SIZE:
+            response_cache.popitem(last=False)
+
+def preload_ollama_model(model: str) -> None:
+    """Load the model into Ollama in the background so the first chat turn doesn't pay for it"""
+    def _preload():
+        try:
+            # A generate request without a prompt only loads the model
+            get_ollama_session().post(
+                f"{OLLAMA_BASE_URL}/api/generate",
+                json={"model": model, "keep_alive": OLLAMA_KEEP_ALIVE},
+                timeout=120
+            )
+        except requests.exceptions.RequestException:
+            pass
+    
+    threading.Thread(target=_preload, daemon=True).start()
+
 async def get_mcp_tools():
     """Get available tools from the FastMCP server using auto-inferred subprocess transport"""
     try:
@@ -58,9 +180,10 @@ async def call_mcp_tool(tool_name: str, arguments: dict):
     context = retry_manager.create_context(tool_name, arguments)
     
     current_args = arguments.copy()
+    corrections_applied = False
     
     while context.should_retry:
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             # Auto-inferred transport from .py file (FastMCP handles subprocess automatically)
@@ -83,11 +206,11 @@ async def call_mcp_tool(tool_name: str, arguments: dict):
                     content = str(result)
                 
                 # Success - record attempt and return
-                execution_time = time.time() - start_time
+                execution_time = time.perf_counter() - start_time
                 context.add_attempt(
                     error_type=ErrorType.UNKNOWN_ERROR,
                     error_message="Success",
-                    corrected_args=current_args if current_args != arguments else None,
+                    corrected_args=current_args if corrections_applied else None,
                     success=True,
                     execution_time=execution_time
                 )
@@ -102,7 +225,7 @@ async def call_mcp_tool(tool_name: str, arguments: dict):
                 return content
                 
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             error_message = str(e)
             error_type = ErrorAnalyzer.analyze_error(error_message)
             
@@ -118,9 +241,9 @@ async def call_mcp_tool(tool_name: str, arguments: dict):
                 corrected_args = ErrorAnalyzer.suggest_type_correction(current_args, error_message)
                 if corrected_args:
                     current_args = corrected_args
+                    corrections_applied = True
                     # Apply exponential backoff before retry
-                    delay = 0.5 * (2 ** (context.attempt_count - 1))
-                    await asyncio.sleep(delay)
+                    await retry_manager.backoff_delay(context.attempt_count)
                     continue
             
             # If we can't correct the error or out of retries, return error response
@@ -128,8 +251,7 @@ async def call_mcp_tool(tool_name: str, arguments: dict):
                 return _generate_enhanced_error_response(tool_name, context)
                 
             # Apply exponential backoff before retry
-            delay = 0.5 * (2 ** (context.attempt_count - 1))
-            await asyncio.sleep(delay)
+            await retry_manager.backoff_delay(context.attempt_count)
     
     # Fallback - should not reach here
     return _generate_enhanced_error_response(tool_name, context)
@@ -150,14 +272,10 @@ def _generate_enhanced_error_response(tool_name: str, context) -> str:
         if last_attempt.error_type.value == "type_error":
             error_parts.append("\n**💡 Type Error Suggestions**:")
             for key, value in context.original_args.items():
-                if isinstance(value, str):
-                    if ErrorAnalyzer._looks_like_int(value):
-                        error_parts.append(f"• Parameter `{key}`: Use integer `{int(value)}` instead of string `'{value}'`")
-                    elif ErrorAnalyzer._looks_like_float(value):
-                        error_parts.append(f"• Parameter `{key}`: Use float `{float(value)}` instead of string `'{value}'`")
-                    elif ErrorAnalyzer._looks_like_bool(value):
-                        bool_val = ErrorAnalyzer._parse_bool(value)
-                        error_parts.append(f"• Parameter `{key}`: Use boolean `{bool_val}` instead of string `'{value}'`")
+                suggestion = ErrorAnalyzer._suggest_typed_value(value)
+                if suggestion:
+                    type_label, typed_value = suggestion
+                    error_parts.append(f"• Parameter `{key}`: Use {type_label} `{typed_value}` instead of string `'{value}'`")
         
         # Show attempt summary
         error_parts.append(f"\n**Retry History**:")
@@ -170,22 +288,45 @@ def _generate_enhanced_error_response(tool_name: str, context) -> str:
     
     return "\n".join(error_parts)
 
-def get_ollama_models() -> List[str]:
-    """Fetch available Ollama models from the local Ollama instance."""
+@st.cache_data(ttl=15, show_spinner=False)
+def get_ollama_models() -> Tuple[str, ...]:
+    """Fetch available Ollama models from the local Ollama instance.
+    
+    Cached briefly so every Streamlit rerun doesn't hit /api/tags (and concurrent sessions share
+    one lookup); a tuple so callers can't mutate the cached value.
+    """
     try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=5)
+        response = get_ollama_session().get(f"{OLLAMA_BASE_URL}/api/tags", timeout=5)
         if response.status_code == 200:
             data = response.json()
-            return [model['name'] for model in data.get('models', [])]
+            return tuple(model['name'] for model in data.get('models', []))
         else:
-            return []
+            return ()
     except:
-        return []
+        return ()
+
+# Concise inline descriptions for the sidebar tool list, keyed by MCP tool name
+TOOL_PURPOSES = {
+    'web_search': "web search",
+    'analyze_url': "webpage summary",
+    'save_link': "save webpage content",
+    'arxiv_search': "academic papers",
+    'get_stock_overview': "stock market data",
+    'analyze_youtube_url': "video analysis",
+    'get_weather': "weather forecast",
+    'list_toronto_neighbourhoods': "list all Toronto neighbourhoods for crime data",
+    'get_tide_info': "tide information",
+    'get_toronto_crime': "crime statistics",
+    'analyze_canadian_economy': "economic analysis",
+}
 
 def create_function_schema_from_mcp_tools(mcp_tools: List[Dict]) -> List[Dict]:
-    """Convert MCP tools to OpenAI function schema format using FastMCP's native schemas"""
+    """Convert MCP tools to OpenAI function schema format using FastMCP's native schemas.
+    
+    Tools are emitted sorted by name so the serialized tool list is identical on every request.
+    """
     schemas = []
-    for tool in mcp_tools:
+    for tool in sorted(mcp_tools, key=lambda tool: tool["name"]):
         # Use FastMCP's native schema generation instead of manual inference
         schema = {
             "type": "function",
@@ -203,16 +344,29 @@ def create_function_schema_from_mcp_tools(mcp_tools: List[Dict]) -> List[Dict]:
     
     return schemas
 
-async def chat_with_ollama_and_mcp(model: str, message: str, conversation_history: List[Dict], use_functions: bool = True) -> str:
+@st.cache_resource(max_entries=2, show_spinner=False)
+def get_system_message(current_date: str) -> Dict:
+    """System message for a given day, built once per process and shared across reruns
+    (treat the returned dict as read-only)"""
+    return {
+        "role": "system",
+        "content": get_system_prompt(current_date)
+    }
+
+async def chat_with_ollama_and_mcp(model: str, message: str, conversation_history: List[Dict], use_functions: bool = True, history_summary: str = "", tool_schemas: Optional[List[Dict]] = None) -> str:
     """
     Send chat message to Ollama with FastMCP function calling support using subprocess transport.
+    
+    conversation_history is the recent history returned by compact_history, sent verbatim
+    after history_summary.
+    tool_schemas are prebuilt function schemas; they are fetched from the MCP server when omitted.
     """
     try:
         # Get MCP tools if functions are enabled
-        mcp_tools = []
         if use_functions:
-            mcp_tools = await get_mcp_tools()
-            if not mcp_tools:
+            if tool_schemas is None:
+                tool_schemas = create_function_schema_from_mcp_tools(await get_mcp_tools())
+            if not tool_schemas:
                 use_functions = False  # Disable if no tools available
         
         # Format conversation for Ollama with system guidance
@@ -220,35 +374,43 @@ async def chat_with_ollama_and_mcp(model: str, message: str, conversation_histor
         
         # Add system message for function calling guidance
         if use_functions:
-            current_date = datetime.now().strftime("%Y-%m-%d")
-            system_message = {
+            messages.append(get_system_message(date.today().isoformat()))
+        
+        # Older turns are carried as a summary rather than verbatim
+        if history_summary:
+            messages.append({
                 "role": "system",
-                "content": get_system_prompt(current_date)
-            }
-            messages.append(system_message)
+                "content": f"Summary of the earlier conversation: {history_summary}"
+            })
         
-        for msg in conversation_history:
-            messages.append({"role": msg["role"], "content": msg["content"]})
+        # compact_history caps this below two windows, so prompt size stays bounded
+        messages.extend(
+            {"role": msg["role"], "content": msg["content"]}
+            for msg in conversation_history
+        )
         messages.append({"role": "user", "content": message})
         
         # Prepare request data
         request_data = {
             "model": model,
-            "messages": messages,
-            "stream": False
+            "messages": messages
         }
         
         # Add tools if function calling is enabled
-        if use_functions and mcp_tools:
-            request_data["tools"] = create_function_schema_from_mcp_tools(mcp_tools)
+        if use_functions:
+            request_data["tools"] = tool_schemas
+        
+        # Identical tool-free requests get the same reply, so serve repeats from memory
+        response_cache_key = None
+        if "tools" not in request_data:
+            response_cache_key = _response_cache_key(request_data)
+            cached_content = get_cached_response(response_cache_key)
+            if cached_content is not None:
+                return cached_content
         
         # First request with or without tools
         try:
-            response = requests.post(
-                "http://localhost:11434/api/chat",
-                json=request_data,
-                timeout=60
-            )
+            response = await asyncio.to_thread(post_ollama_chat, request_data)
             
             if response.status_code != 200:
                 error_detail = ""
@@ -263,17 +425,13 @@ async def chat_with_ollama_and_mcp(model: str, message: str, conversation_histor
                     print(f"DEBUG: Function calling failed for model {model}, retrying without tools")
                     request_data_fallback = {
                         "model": model,
-                        "messages": messages,
-                        "stream": False
+                        "messages": messages
                     }
-                    fallback_response = requests.post(
-                        "http://localhost:11434/api/chat",
-                        json=request_data_fallback,
-                        timeout=60
-                    )
+                    fallback_response = await asyncio.to_thread(post_ollama_chat, request_data_fallback)
                     if fallback_response.status_code == 200:
-                        data = fallback_response.json()
+                        data = await asyncio.to_thread(read_ollama_chat, fallback_response)
                         return data.get("message", {}).get("content", "No response")
+                    fallback_response.close()
                 
                 return f"Error {response.status_code}: {error_detail}"
         except requests.exceptions.Timeout:
@@ -281,7 +439,7 @@ async def chat_with_ollama_and_mcp(model: str, message: str, conversation_histor
         except requests.exceptions.ConnectionError:
             return "Error: Could not connect to Ollama. Is it running on localhost:11434?"
         
-        data = response.json()
+        data = await asyncio.to_thread(read_ollama_chat, response)
         assistant_message = data.get("message", {})
         
         # Check if there are tool calls (only if functions are enabled)
@@ -295,26 +453,25 @@ async def chat_with_ollama_and_mcp(model: str, message: str, conversation_histor
                 print("DEBUG: AI chose NOT to use any functions")
         
         if tool_calls and use_functions:
-            # Execute function calls using FastMCP
-            function_results = []
-            function_names = []
+            # Execute function calls concurrently using FastMCP (each call is I/O bound)
+            function_names = [tool_call.get("function", {}).get("name", "") for tool_call in tool_calls]
+            raw_results = await asyncio.gather(
+                *(call_mcp_tool(name, tool_call.get("function", {}).get("arguments", {}))
+                  for name, tool_call in zip(function_names, tool_calls)),
+                return_exceptions=True
+            )
+            function_results = [
+                f"Error executing {name}: {result}" if isinstance(result, Exception) else result
+                for name, result in zip(function_names, raw_results)
+            ]
             
-            for tool_call in tool_calls:
-                function_info = tool_call.get("function", {})
-                function_name = function_info.get("name", "")
-                arguments = function_info.get("arguments", {})
-                
-                # Execute the function using FastMCP
-                result = await call_mcp_tool(function_name, arguments)
-                function_results.append(result)
-                function_names.append(function_name)
-                
-                # Add tool call and result to conversation
-                messages.append({
-                    "role": "assistant",
-                    "content": assistant_message.get("content", ""),
-                    "tool_calls": tool_calls
-                })
+            # Add the tool-calling turn once, followed by one result message per call
+            messages.append({
+                "role": "assistant",
+                "content": assistant_message.get("content", ""),
+                "tool_calls": tool_calls
+            })
+            for result in function_results:
                 messages.append({
                     "role": "tool",
                     "content": result
@@ -322,18 +479,13 @@ async def chat_with_ollama_and_mcp(model: str, message: str, conversation_histor
             
             # Get final response with tool results
             try:
-                final_response = requests.post(
-                    "http://localhost:11434/api/chat",
-                    json={
-                        "model": model,
-                        "messages": messages,
-                        "stream": False
-                    },
-                    timeout=60
-                )
+                final_response = await asyncio.to_thread(post_ollama_chat, {
+                    "model": model,
+                    "messages": messages
+                })
                 
                 if final_response.status_code == 200:
-                    final_data = final_response.json()
+                    final_data = await asyncio.to_thread(read_ollama_chat, final_response)
                     final_content = final_data.get("message", {}).get("content", "")
                     
                     # Format response with function results
@@ -370,11 +522,79 @@ async def chat_with_ollama_and_mcp(model: str, message: str, conversation_histor
                 return f"Error in final response: {str(e)}"
         else:
             # No tool calls, return regular response
-            return assistant_message.get("content", "No response")
+            content = assistant_message.get("content", "No response")
+            if response_cache_key:
+                cache_response(response_cache_key, content)
+            return content
             
     except Exception as e:
         return f"Error connecting to Ollama or MCP: {str(e)}"
 
+SUMMARY_PROMPT = (
+    "Summarize the conversation below in a few sentences. Keep facts, names, numbers and "
+    "open questions the assistant may need later; skip greetings and filler."
+)
+
+def summarize_conversation(model: str, previous_summary: str, messages: List[Dict]) -> str:
+    """Fold messages (and any earlier summary) into a single short summary using the chat model.
+    
+    Raises RuntimeError when Ollama rejects the request or returns an empty summary.
+    """
+    transcript = "\n".join(f"{msg['role']}: {msg['content']}" for msg in messages)
+    if previous_summary:
+        transcript = f"Earlier summary: {previous_summary}\n\n{transcript}"
+    
+    response = post_ollama_chat({
+        "model": model,
+        "messages": [
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {"role": "user", "content": transcript}
+        ]
+    })
+    if response.status_code != 200:
+        response.close()  # Unread streamed body; release the pooled connection
+        raise RuntimeError(f"Summary request failed with status {response.status_code}")
+    summary = read_ollama_chat(response)["message"]["content"].strip()
+    if not summary:
+        raise RuntimeError("Summary request returned no content")
+    return summary
+
+def reset_history_summary() -> None:
+    """Start a fresh running summary (new session or cleared conversation)"""
+    st.session_state.history_summary = ""
+    st.session_state.summarized_count = 0
+    st.session_state.summary_failures = 0
+    st.session_state.summary_retry_at = 0
+
+def compact_history(model: str, conversation_history: List[Dict]) -> List[Dict]:
+    """Fold older messages into the running summary and return the messages to send verbatim.
+    
+    At most one window is folded per call, so a summary request never grows with the
+    history. summarized_count only advances after a summary comes back; failed folds are
+    retried after 1, 2, 4 and then every 8 turns. While a backlog is pending only the latest
+    window is returned, so the prompt stays bounded whether or not summarizing works.
+    """
+    window = 2 * MAX_HISTORY_TURNS
+    state = st.session_state
+    unsummarized = len(conversation_history) - state.summarized_count
+    
+    if unsummarized >= 2 * window and len(conversation_history) >= state.summary_retry_at:
+        older = conversation_history[state.summarized_count:state.summarized_count + window]
+        try:
+            state.history_summary = summarize_conversation(model, state.history_summary, older)
+            state.summarized_count += window
+            state.summary_failures = 0
+            unsummarized -= window
+        except (requests.exceptions.RequestException, RuntimeError, ValueError):
+            state.summary_failures += 1
+            # Two messages per turn
+            state.summary_retry_at = len(conversation_history) + 2 * min(2 ** (state.summary_failures - 1), 8)
+    
+    if unsummarized < 2 * window:
+        return conversation_history[state.summarized_count:]
+    # Folds are behind: send the summary so far plus the latest window until they catch up
+    return conversation_history[-window:]
+
 def chat_with_ollama_sync(*args, **kwargs):
     """Synchronous wrapper for the async chat function"""
     loop = asyncio.new_event_loop()
@@ -406,6 +626,9 @@ if "selected_model" not in st.session_state:
 if "use_functions" not in st.session_state:
     st.session_state.use_functions = True
 
+if "summary_retry_at" not in st.session_state:
+    reset_history_summary()
+
 # Centered layout with breathing room
 col1, col2, col3 = st.columns([1, 3, 1])
 
@@ -416,7 +639,14 @@ with col2:
     # Status section with expandable hierarchy
     models = get_ollama_models()
     if models:
-        mcp_tools = get_mcp_tools_sync() if st.session_state.get('use_functions', True) else []
+        # Tool list and schemas are fetched once per session instead of on every rerun
+        if st.session_state.get('use_functions', True):
+            if not st.session_state.get("mcp_tools"):
+                st.session_state.mcp_tools = get_mcp_tools_sync()
+                st.session_state.tool_schemas = create_function_schema_from_mcp_tools(st.session_state.mcp_tools)
+            mcp_tools = st.session_state.mcp_tools
+        else:
+            mcp_tools = []
         tool_count = len(mcp_tools)
         
         # Create expandable status hierarchy
@@ -444,30 +674,7 @@ with col2:
                     tool_name = tool['name']
                     
                     # Extract concise inline descriptions
-                    if 'web_search' in tool_name:
-                        purpose = "web search"
-                    elif 'analyze_url' in tool_name:
-                        purpose = "webpage summary"
-                    elif 'save_link' in tool_name:
-                        purpose = "save webpage content"
-                    elif 'arxiv_search' in tool_name:
-                        purpose = "academic papers"
-                    elif 'get_stock_overview' in tool_name:
-                        purpose = "stock market data"
-                    elif 'analyze_youtube_url' in tool_name:
-                        purpose = "video analysis"
-                    elif 'get_weather' in tool_name:
-                        purpose = "weather forecast"
-                    elif 'list_toronto_neighbourhoods' in tool_name:
-                        purpose = "list all Toronto neighbourhoods for crime data"
-                    elif 'get_tide_info' in tool_name:
-                        purpose = "tide information"
-                    elif 'get_toronto_crime' in tool_name:
-                        purpose = "crime statistics"
-                    elif 'analyze_canadian_economy' in tool_name:
-                        purpose = "economic analysis"
-                    else:
-                        purpose = "specialized tool"
+                    purpose = TOOL_PURPOSES.get(tool_name, "specialized tool")
                     
                     # Add tree-like formatting with inline descriptions
                     if i == len(mcp_tools) - 1:
@@ -515,6 +722,11 @@ with col2:
                 label_visibility="collapsed"
             )
             st.session_state.selected_model = models[selected_index]
+            
+            # Warm the newly selected model once instead of on the first message
+            if st.session_state.get("preloaded_model") != st.session_state.selected_model:
+                preload_ollama_model(st.session_state.selected_model)
+                st.session_state.preloaded_model = st.session_state.selected_model
         
         with col_func:
             st.session_state.use_functions = st.checkbox(
@@ -536,6 +748,7 @@ with col2:
         if st.session_state.messages:
             if st.button("Clear conversation", type="secondary", help="Clear all messages"):
                 st.session_state.messages = []
+                reset_history_summary()
                 st.rerun()
         
         # Display chat messages
@@ -572,11 +785,15 @@ with col2:
             # Get AI response
             with st.chat_message("assistant"):
                 with st.spinner("Thinking..."):
+                    conversation_history = st.session_state.messages[:-1]  # Exclude the just-added user message
+                    recent_history = compact_history(st.session_state.selected_model, conversation_history)
                     response = chat_with_ollama_sync(
                         st.session_state.selected_model, 
                         prompt, 
-                        st.session_state.messages[:-1],  # Exclude the just-added user message
-                        st.session_state.use_functions
+                        recent_history,
+                        st.session_state.use_functions,
+                        history_summary=st.session_state.history_summary,
+                        tool_schemas=st.session_state.get("tool_schemas") or None  # None refetches
                     )
                 st.markdown(response)
             
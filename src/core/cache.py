@@ -5,33 +5,24 @@ This file is maintained for backward compatibility only.
 All new caching should use the unified SQLite-based system.
 """
 
-import logging
-import os
-import tempfile
-from datetime import datetime
-from typing import Dict, Optional
-from .unified_cache import get_cached_data, save_cached_data as save_unified_data, cleanup_cache
+import warnings
 
-logger = logging.getLogger(__name__)
+from .unified_cache import get_cached_data, save_cached_data, cleanup_cache
 
-# Backward compatibility functions - redirect to unified cache
-def load_cached_data(cache_key: str) -> Optional[Dict]:
-    """DEPRECATED: Use unified_cache.get_cached_data instead"""
-    logger.warning("load_cached_data is deprecated, use unified_cache.get_cached_data")
-    return get_cached_data(cache_key, "default")
+# Warn once when the shim is imported rather than on every cache call
+warnings.warn(
+    "src.core.cache is deprecated, use src.core.unified_cache "
+    "(get_cached_data, save_cached_data, cleanup_cache)",
+    DeprecationWarning,
+    stacklevel=2
+)
 
-
-def save_cached_data(cache_key: str, data: Dict) -> None:
-    """DEPRECATED: Use unified_cache.save_cached_data instead"""
-    logger.warning("save_cached_data is deprecated, use unified_cache.save_cached_data")
-    save_unified_data(cache_key, data, "default")
-
-
-def cleanup_old_cache() -> None:
-    """DEPRECATED: Use unified_cache.cleanup_cache instead"""
-    logger.warning("cleanup_old_cache is deprecated, use unified_cache.cleanup_cache")
-    cleanup_cache()
+# Backward compatibility names - plain aliases of the unified cache functions, so calls
+# don't go through an extra wrapper. The unified defaults (cache_type="default") match
+# the old signatures.
+load_cached_data = get_cached_data
+cleanup_old_cache = cleanup_cache
 
 
 # All transcript caching functionality has been moved to unified_cache.py
-# YouTube tools now use the unified caching system with proper table schemas
\ No newline at end of file
+# YouTube tools now use the unified caching system with proper table schemas
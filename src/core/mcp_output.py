@@ -14,9 +14,13 @@ Key principles:
 from typing import List, Dict, Any, Optional, Union
 import base64
 import io
+import re
 from mcp.types import TextContent, ImageContent, ContentBlock, Annotations
 from fastmcp.tools.tool import ToolResult
 
+# Markdown image with an inline base64 data URI: ![alt](data:image/<format>;base64,<data>)
+_IMG_RE = re.compile(r'!\[([^\]]*)\]\(data:image/([^;]+);base64,([^)]+)\)')
+
 def create_text_content(
     text: str,
     mime_type: str = "text/markdown",
@@ -70,8 +74,8 @@ def create_image_content(
     
     # Handle different input formats
     if isinstance(image_data, bytes):
-        # Convert bytes to base64
-        data = base64.b64encode(image_data).decode('utf-8')
+        # Convert bytes to base64 (output is pure ASCII, so use the cheaper codec)
+        data = base64.b64encode(image_data).decode('ascii')
     elif isinstance(image_data, str):
         # Remove data URI prefix if present
         if image_data.startswith('data:'):
@@ -193,9 +197,10 @@ def extract_chart_from_matplotlib() -> Optional[str]:
         buffer = io.BytesIO()
         plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight',
                    facecolor='white', edgecolor='none')
-        buffer.seek(0)
         
-        plot_data = base64.b64encode(buffer.getvalue()).decode('utf-8')
+        # Encode straight from the buffer's memory instead of copying it out with getvalue()
+        with buffer.getbuffer() as raw:
+            plot_data = base64.b64encode(raw).decode('ascii')
         plt.close()
         buffer.close()
         
@@ -218,14 +223,17 @@ def convert_markdown_with_base64_to_content_blocks(
     Args:
         markdown_text: Markdown text that may contain ![](data:image/png;base64,...)
     """
-    import re
-    
-    # Extract base64 images from markdown
-    img_pattern = r'!\[([^\]]*)\]\(data:image/([^;]+);base64,([^)]+)\)'
-    images = re.findall(img_pattern, markdown_text)
-    
-    # Remove images from markdown text
-    text_only = re.sub(img_pattern, lambda m: f"*[Chart: {m.group(1) or 'Visualization'}]*", markdown_text)
+    # Single pass: collect images and replace each with a placeholder as we go
+    text_parts = []
+    images = []
+    prev_end = 0
+    for match in _IMG_RE.finditer(markdown_text):
+        text_parts.append(markdown_text[prev_end:match.start()])
+        text_parts.append(f"*[Chart: {match.group(1) or 'Visualization'}]*")
+        images.append(match.groups())
+        prev_end = match.end()
+    text_parts.append(markdown_text[prev_end:])
+    text_only = ''.join(text_parts)
     
     content_blocks: List[ContentBlock] = []
     
@@ -5,17 +5,28 @@ Based on research from "Gradientsys: A Multi-Agent LLM Scheduler with ReAct Orch
 and modern agentic system patterns for robust tool retry mechanisms.
 """
 
+import asyncio
 import logging
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Callable, Union, Tuple
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Any, Callable, Union, Tuple
 from enum import Enum
 import re
-import json
 
 logger = logging.getLogger(__name__)
 
 
+# Strings accepted as booleans when correcting LLM arguments
+_BOOL_STRINGS = {'true': True, '1': True, 'yes': True, 'false': False, '0': False, 'no': False}
+
+
+def _compile_union(patterns: Iterable[str]) -> "re.Pattern[str]":
+    """Compile several regexes into one alternation, so a single search tries them all"""
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+
+
 class ErrorType(Enum):
     """Categories of tool execution errors for targeted recovery"""
     TYPE_ERROR = "type_error"
@@ -26,7 +37,11 @@ class ErrorType(Enum):
     UNKNOWN_ERROR = "unknown_error"
 
 
-@dataclass
+# Error types that corrected arguments can fix; other errors only get backoff and retry
+_CORRECTABLE_ERRORS = frozenset({ErrorType.TYPE_ERROR, ErrorType.VALIDATION_ERROR})
+
+
+@dataclass(slots=True)
 class RetryAttempt:
     """Record of a single retry attempt"""
     attempt_number: int
@@ -38,7 +53,7 @@ class RetryAttempt:
     execution_time: float = 0.0
 
 
-@dataclass 
+@dataclass(slots=True)
 class RetryContext:
     """State management for tool retry attempts"""
     tool_name: str
@@ -47,10 +62,17 @@ class RetryContext:
     attempts: List[RetryAttempt] = field(default_factory=list)
     last_error: Optional[str] = None
     corrected_args: Optional[Dict[str, Any]] = None
+    # Set once any attempt ran with corrected arguments; corrected_args only keeps the latest
+    had_corrections: bool = False
+    # Running totals kept by add_attempt so stats don't re-walk the attempt list
+    _total_time: float = field(default=0.0, init=False, repr=False)
+    _success_count: int = field(default=0, init=False, repr=False)
+    # Successes counted by record_success without a RetryAttempt in the history
+    _untracked_successes: int = field(default=0, init=False, repr=False)
     
     @property
     def attempt_count(self) -> int:
-        return len(self.attempts)
+        return len(self.attempts) + self._untracked_successes
     
     @property
     def should_retry(self) -> bool:
@@ -58,7 +80,11 @@ class RetryContext:
     
     @property
     def total_execution_time(self) -> float:
-        return sum(attempt.execution_time for attempt in self.attempts)
+        return self._total_time
+    
+    @property
+    def success_count(self) -> int:
+        return self._success_count
     
     def add_attempt(self, error_type: ErrorType, error_message: str, 
                    corrected_args: Optional[Dict[str, Any]] = None,
@@ -74,18 +100,27 @@ class RetryContext:
             execution_time=execution_time
         )
         self.attempts.append(attempt)
+        self._total_time += execution_time
+        self._success_count += success
         
         if not success:
             self.last_error = error_message
         if corrected_args:
             self.corrected_args = corrected_args
+            self.had_corrections = True
+    
+    def record_success(self, execution_time: float = 0.0) -> None:
+        """Count a successful attempt without adding a RetryAttempt to the history"""
+        self._untracked_successes += 1
+        self._total_time += execution_time
+        self._success_count += 1
 
 
 class ErrorAnalyzer:
     """Analyzes tool execution errors and suggests corrections"""
     
     # Common type error patterns
-    TYPE_ERROR_PATTERNS = [
+    TYPE_ERROR_PATTERNS = (
         (r"expected.*int.*got.*str", ErrorType.TYPE_ERROR),
         (r"expected.*float.*got.*str", ErrorType.TYPE_ERROR), 
         (r"expected.*bool.*got.*str", ErrorType.TYPE_ERROR),
@@ -96,43 +131,54 @@ class ErrorAnalyzer:
         (r"invalid literal for int\(\) with base \d+:", ErrorType.TYPE_ERROR),
         (r"could not convert string to float:", ErrorType.TYPE_ERROR),
         (r"argument must be.*not.*str", ErrorType.TYPE_ERROR),
-    ]
+    )
     
     # Network and resource error patterns
-    NETWORK_ERROR_PATTERNS = [
+    NETWORK_ERROR_PATTERNS = (
         (r"connection.*refused", ErrorType.NETWORK_ERROR),
         (r"timeout", ErrorType.NETWORK_ERROR),
         (r"http.*error", ErrorType.NETWORK_ERROR),
         (r"http.*503", ErrorType.NETWORK_ERROR),
         (r"dns.*resolution.*failed", ErrorType.NETWORK_ERROR),
-    ]
+    )
     
     # Permission and access error patterns  
-    PERMISSION_ERROR_PATTERNS = [
+    PERMISSION_ERROR_PATTERNS = (
         (r"permission.*denied", ErrorType.PERMISSION_ERROR),
         (r"access.*denied", ErrorType.PERMISSION_ERROR),
         (r"unauthorized", ErrorType.PERMISSION_ERROR),
         (r"403.*forbidden", ErrorType.PERMISSION_ERROR),
-    ]
+    )
+    
+    # Each category's patterns fused into one regex, in priority order: type errors first
+    # (most common for LLM tools), then network, then permission. Categories stay separate
+    # so an earlier category still wins even when a later one matches further left.
+    # Every pattern in a category needs at least one of its hint substrings, so a message
+    # with none of them can skip that regex
+    CATEGORY_REGEXES = (
+        (("got", "must be", "integer", "int()", "convert"),
+         _compile_union(p for p, _ in TYPE_ERROR_PATTERNS), ErrorType.TYPE_ERROR),
+        (("connection", "timeout", "http", "dns"),
+         _compile_union(p for p, _ in NETWORK_ERROR_PATTERNS), ErrorType.NETWORK_ERROR),
+        (("denied", "unauthorized", "forbidden"),
+         _compile_union(p for p, _ in PERMISSION_ERROR_PATTERNS), ErrorType.PERMISSION_ERROR),
+    )
+    
+    # Ways an error message names the offending parameter, tried in order
+    FAILED_PARAM_REGEXES = (
+        re.compile(r"Parameter '(\w+)'"),
+        re.compile(r"'(\w+)' must be"),
+        re.compile(r"Parameter (\w+) must be"),
+    )
     
     @classmethod
+    @lru_cache(maxsize=256)
     def analyze_error(cls, error_message: str) -> ErrorType:
-        """Categorize error based on message patterns"""
+        """Categorize error based on message patterns (memoized: retries often repeat an error)"""
         error_lower = error_message.lower()
         
-        # Check type errors first (most common for LLM tools)
-        for pattern, error_type in cls.TYPE_ERROR_PATTERNS:
-            if re.search(pattern, error_lower):
-                return error_type
-                
-        # Check network errors
-        for pattern, error_type in cls.NETWORK_ERROR_PATTERNS:
-            if re.search(pattern, error_lower):
-                return error_type
-                
-        # Check permission errors
-        for pattern, error_type in cls.PERMISSION_ERROR_PATTERNS:
-            if re.search(pattern, error_lower):
+        for hints, regex, error_type in cls.CATEGORY_REGEXES:
+            if any(hint in error_lower for hint in hints) and regex.search(error_lower):
                 return error_type
                 
         return ErrorType.UNKNOWN_ERROR
@@ -140,108 +186,115 @@ class ErrorAnalyzer:
     @classmethod
     def suggest_type_correction(cls, args: Dict[str, Any], error_message: str) -> Optional[Dict[str, Any]]:
         """Suggest corrected arguments for common type errors"""
-        corrected_args = args.copy()
-        made_corrections = False
+        # Copied on the first correction, so calls that change nothing don't clone args
+        corrected_args = None
         
-        # Extract the parameter name that caused the error from the error message
+        # Extract the parameter name that caused the error from the error message; it only
+        # matters when the error asks for a bool (0/1 integers are then converted too)
         failed_param = cls._extract_failed_param_from_error(error_message)
+        bool_param = failed_param if failed_param and "must be bool" in error_message.lower() else None
         
         for key, value in args.items():
             if isinstance(value, str):
-                # Check if this parameter needs boolean conversion based on error message
-                if failed_param == key and "must be bool" in error_message.lower():
-                    if cls._looks_like_bool(value):
-                        bool_value = cls._parse_bool(value)
-                        if bool_value is not None:
-                            corrected_args[key] = bool_value
-                            made_corrections = True
-                            logger.info(f"Type correction: {key} '{value}' -> {bool_value}")
-                            continue
-                
-                # Try to convert string numbers to appropriate types
-                if cls._looks_like_bool(value):
-                    bool_value = cls._parse_bool(value)
-                    if bool_value is not None:
-                        corrected_args[key] = bool_value
-                        made_corrections = True
-                        logger.info(f"Type correction: {key} '{value}' -> {bool_value}")
-                elif cls._looks_like_int(value):
-                    try:
-                        corrected_args[key] = int(value)
-                        made_corrections = True
-                        logger.info(f"Type correction: {key} '{value}' -> {int(value)}")
-                    except ValueError:
-                        pass
-                elif cls._looks_like_float(value):
-                    try:
-                        corrected_args[key] = float(value)
-                        made_corrections = True
-                        logger.info(f"Type correction: {key} '{value}' -> {float(value)}")
-                    except ValueError:
-                        pass
+                # Try to convert string values to the type they spell: bool, then int, then float.
+                # The shape checks guarantee int()/float() succeed
+                corrected = cls._parse_bool(value)
+                if corrected is None:
+                    if cls._looks_like_int(value):
+                        corrected = int(value)
+                    elif cls._looks_like_float(value):
+                        corrected = float(value)
+                    else:
+                        continue
+                if corrected_args is None:
+                    corrected_args = args.copy()
+                corrected_args[key] = corrected
+                logger.info("Type correction: %s '%s' -> %s", key, value, corrected)
             
             # Handle cases where integer was converted but boolean is needed
-            elif isinstance(value, int) and failed_param == key and "must be bool" in error_message.lower():
-                if value in [0, 1]:
-                    bool_value = bool(value)
-                    corrected_args[key] = bool_value
-                    made_corrections = True
-                    logger.info(f"Type correction: {key} {value} -> {bool_value}")
+            elif key == bool_param and isinstance(value, int) and value in (0, 1):
+                bool_value = bool(value)
+                if corrected_args is None:
+                    corrected_args = args.copy()
+                corrected_args[key] = bool_value
+                logger.info("Type correction: %s %s -> %s", key, value, bool_value)
         
-        return corrected_args if made_corrections else None
+        return corrected_args
     
-    @staticmethod
-    def _extract_failed_param_from_error(error_message: str) -> Optional[str]:
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _extract_failed_param_from_error(cls, error_message: str) -> Optional[str]:
         """Extract parameter name from error message"""
-        import re
         # Look for patterns like "Parameter 'param_name'" or "'param_name' must be"
-        patterns = [
-            r"Parameter '(\w+)'",
-            r"'(\w+)' must be",
-            r"Parameter (\w+) must be"
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, error_message)
+        for regex in cls.FAILED_PARAM_REGEXES:
+            match = regex.search(error_message)
             if match:
                 return match.group(1)
         
         return None
     
+    @classmethod
+    def _suggest_typed_value(cls, value: Any) -> Optional[Tuple[str, Any]]:
+        """Classify a string argument in one pass for error suggestions.
+        
+        Returns (type label, converted value) - checking integer, then float, then
+        boolean - or None if the value isn't a string that spells one of them.
+        """
+        if not isinstance(value, str):
+            return None
+        if cls._looks_like_int(value):
+            return "integer", int(value)
+        if cls._looks_like_float(value):
+            return "float", float(value)
+        bool_value = cls._parse_bool(value)
+        if bool_value is not None:
+            return "boolean", bool_value
+        return None
+    
     @staticmethod
     def _looks_like_int(value: str) -> bool:
-        """Check if string looks like an integer"""
-        return bool(re.match(r'^-?\d+$', value.strip()))
+        """Check if string looks like an integer (optional '-' then decimal digits)"""
+        value = value.strip()
+        if value.startswith('-'):
+            value = value[1:]
+        # isdecimal() accepts exactly the characters the old \d regex did (and int() does)
+        return value.isdecimal()
     
     @staticmethod
     def _looks_like_float(value: str) -> bool:
-        """Check if string looks like a float"""
-        return bool(re.match(r'^-?\d+\.\d+$', value.strip()))
+        """Check if string looks like a float (optional '-', digits, '.', digits)"""
+        value = value.strip()
+        if value.startswith('-'):
+            value = value[1:]
+        whole, dot, fraction = value.partition('.')
+        return bool(dot) and whole.isdecimal() and fraction.isdecimal()
     
     @staticmethod
     def _looks_like_bool(value: str) -> bool:
         """Check if string looks like a boolean"""
-        return value.lower().strip() in ['true', 'false', '1', '0', 'yes', 'no']
+        return value.lower().strip() in _BOOL_STRINGS
     
     @staticmethod
     def _parse_bool(value: str) -> Optional[bool]:
         """Parse string to boolean"""
-        value_lower = value.lower().strip()
-        if value_lower in ['true', '1', 'yes']:
-            return True
-        elif value_lower in ['false', '0', 'no']:
-            return False
-        return None
+        return _BOOL_STRINGS.get(value.lower().strip())
 
 
 class RetryManager:
     """Orchestrates tool retry logic with exponential backoff and state management"""
     
-    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, enable_state_management: bool = True):
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, enable_state_management: bool = True,
+                 max_contexts: int = 1024, track_success_details: bool = True):
         self.max_attempts = max_attempts
         self.base_delay = base_delay
         self.enable_state_management = enable_state_management
-        self.active_contexts: Dict[str, RetryContext] = {}
+        # When False, a first-try success is only counted on the context, not recorded as a
+        # RetryAttempt; successes after retries are always recorded in full
+        self.track_success_details = track_success_details
+        # Most recent context per distinct call, least recently used first; capped at
+        # max_contexts so a long session doesn't keep every call's attempt history
+        self.active_contexts: "OrderedDict[tuple, RetryContext]" = OrderedDict()
+        self.max_contexts = max_contexts
         
         # Initialize state manager if enabled
         self._state_manager = None
@@ -251,58 +304,81 @@ class RetryManager:
                 self._state_manager = get_retry_state_manager()
                 logger.info("Retry state management enabled")
             except Exception as e:
-                logger.warning(f"Failed to initialize retry state management: {e}")
+                logger.warning("Failed to initialize retry state management: %s", e)
                 self.enable_state_management = False
         
     def create_context(self, tool_name: str, args: Dict[str, Any]) -> RetryContext:
         """Create a new retry context for a tool execution"""
-        context_key = f"{tool_name}_{hash(str(sorted(args.items())))}"
+        context_key = self._context_key(tool_name, args)
         context = RetryContext(
             tool_name=tool_name,
             original_args=args,
             max_attempts=self.max_attempts
         )
+        if context_key in self.active_contexts:
+            self.active_contexts.move_to_end(context_key)
+        elif len(self.active_contexts) >= self.max_contexts:
+            self.active_contexts.popitem(last=False)
         self.active_contexts[context_key] = context
         return context
     
+    @staticmethod
+    def _context_key(tool_name: str, args: Dict[str, Any]) -> tuple:
+        """Build a hashable key for a tool call without stringifying all of its arguments"""
+        items = tuple(sorted(args.items()))
+        try:
+            hash(items)
+        except TypeError:
+            # Unhashable values (lists, dicts) fall back to their repr
+            items = tuple(
+                (key, value if isinstance(value, (str, int, float, bool, type(None))) else repr(value))
+                for key, value in items
+            )
+        return (tool_name, items)
+    
     async def execute_with_retry(self, tool_func: Callable, context: RetryContext) -> Tuple[Any, bool]:
         """Execute tool function with retry logic and error recovery"""
         
         current_args = context.original_args.copy()
+        # Set when an attempt runs with corrected arguments, instead of comparing dicts on success
+        corrections_applied = False
         
         while context.should_retry:
-            start_time = time.time()
+            start_time = time.perf_counter()
             
             try:
                 # Attempt tool execution
                 result = await tool_func(**current_args)
-                execution_time = time.time() - start_time
+                execution_time = time.perf_counter() - start_time
                 
                 # Success - record attempt and return
-                context.add_attempt(
-                    error_type=ErrorType.UNKNOWN_ERROR,
-                    error_message="Success",
-                    corrected_args=current_args if current_args != context.original_args else None,
-                    success=True,
-                    execution_time=execution_time
-                )
+                if self.track_success_details or context.attempts:
+                    context.add_attempt(
+                        error_type=ErrorType.UNKNOWN_ERROR,
+                        error_message="Success",
+                        corrected_args=current_args if corrections_applied else None,
+                        success=True,
+                        execution_time=execution_time
+                    )
+                else:
+                    context.record_success(execution_time)
                 
                 # Record successful retry pattern for learning
                 if self._state_manager and context.attempt_count > 1:
                     try:
                         self._state_manager.record_successful_retry(context)
                     except Exception as e:
-                        logger.warning(f"Failed to record successful retry pattern: {e}")
+                        logger.warning("Failed to record successful retry pattern: %s", e)
                 
-                logger.info(f"Tool {context.tool_name} succeeded on attempt {context.attempt_count}")
+                logger.info("Tool %s succeeded on attempt %s", context.tool_name, context.attempt_count)
                 return result, True
                 
             except Exception as e:
-                execution_time = time.time() - start_time
+                execution_time = time.perf_counter() - start_time
                 error_message = str(e)
                 error_type = ErrorAnalyzer.analyze_error(error_message)
                 
-                logger.warning(f"Tool {context.tool_name} failed on attempt {context.attempt_count}: {error_message}")
+                logger.warning("Tool %s failed on attempt %s: %s", context.tool_name, context.attempt_count, error_message)
                 
                 # Record the failed attempt
                 context.add_attempt(
@@ -313,51 +389,52 @@ class RetryManager:
                 
                 # Try to get predicted correction from state manager first
                 corrected_args = None
-                if self._state_manager and context.should_retry:
+                if self._state_manager and context.should_retry and error_type in _CORRECTABLE_ERRORS:
                     try:
                         predicted_args = self._state_manager.predict_correction(
                             context.tool_name, current_args, error_type
                         )
                         if predicted_args:
                             corrected_args = predicted_args
-                            logger.info(f"Using predicted correction from learned patterns: {corrected_args}")
+                            logger.info("Using predicted correction from learned patterns: %s", corrected_args)
                     except Exception as e:
-                        logger.warning(f"Failed to get predicted correction: {e}")
+                        logger.warning("Failed to get predicted correction: %s", e)
                 
                 # Fall back to rule-based correction if no prediction available
                 if not corrected_args and error_type == ErrorType.TYPE_ERROR and context.should_retry:
                     corrected_args = ErrorAnalyzer.suggest_type_correction(current_args, error_message)
                     if corrected_args:
-                        logger.info(f"Applying rule-based type corrections: {corrected_args}")
+                        logger.info("Applying rule-based type corrections: %s", corrected_args)
                 
                 # Apply corrections if available
                 if corrected_args and context.should_retry:
                     current_args = corrected_args
+                    corrections_applied = True
                     # Apply exponential backoff before retry
-                    await self._backoff_delay(context.attempt_count)
+                    await self.backoff_delay(context.attempt_count)
                     continue
                 
                 # If we can't correct the error or out of retries, fail
                 if not context.should_retry:
-                    logger.error(f"Tool {context.tool_name} failed after {context.attempt_count} attempts")
+                    logger.error("Tool %s failed after %s attempts", context.tool_name, context.attempt_count)
                     return self._generate_error_response(context), False
                     
                 # Apply exponential backoff before retry
-                await self._backoff_delay(context.attempt_count)
+                await self.backoff_delay(context.attempt_count)
         
         # Should not reach here, but handle gracefully
         return self._generate_error_response(context), False
     
-    async def _backoff_delay(self, attempt_number: int) -> None:
-        """Apply exponential backoff delay"""
-        delay = self.base_delay * (2 ** (attempt_number - 1))
-        logger.debug(f"Applying backoff delay: {delay}s")
+    async def backoff_delay(self, attempt_number: int) -> None:
+        """Sleep for the exponential backoff delay after attempt_number failed attempts"""
+        # Doubling per attempt as an integer shift; capped so a runaway count can't overflow
+        delay = self.base_delay * (1 << min(max(attempt_number - 1, 0), 20))
+        logger.debug("Applying backoff delay: %ss", delay)
         await asyncio.sleep(delay)
     
     def _generate_error_response(self, context: RetryContext) -> str:
         """Generate comprehensive error response for LLM with actionable feedback"""
-        error_summary = []
-        error_summary.append(f"❌ Tool '{context.tool_name}' failed after {context.attempt_count} attempts")
+        error_summary = [f"❌ Tool '{context.tool_name}' failed after {context.attempt_count} attempts"]
         
         if context.attempts:
             last_attempt = context.attempts[-1]
@@ -367,20 +444,17 @@ class RetryManager:
             if last_attempt.error_type == ErrorType.TYPE_ERROR:
                 error_summary.append("\n**Suggestions**:")
                 for key, value in context.original_args.items():
-                    if isinstance(value, str):
-                        if ErrorAnalyzer._looks_like_int(value):
-                            error_summary.append(f"- Try passing {key} as integer: {key}={int(value)}")
-                        elif ErrorAnalyzer._looks_like_float(value):
-                            error_summary.append(f"- Try passing {key} as float: {key}={float(value)}")
-                        elif ErrorAnalyzer._looks_like_bool(value):
-                            bool_val = ErrorAnalyzer._parse_bool(value)
-                            error_summary.append(f"- Try passing {key} as boolean: {key}={bool_val}")
+                    suggestion = ErrorAnalyzer._suggest_typed_value(value)
+                    if suggestion:
+                        type_label, typed_value = suggestion
+                        error_summary.append(f"- Try passing {key} as {type_label}: {key}={typed_value}")
             
             # Show attempt history for debugging
-            error_summary.append(f"\n**Attempt History**:")
-            for i, attempt in enumerate(context.attempts, 1):
-                status = "✅" if attempt.success else "❌"
-                error_summary.append(f"{i}. {status} {attempt.error_type.value}: {attempt.error_message[:100]}...")
+            error_summary.append("\n**Attempt History**:")
+            error_summary.extend(
+                f"{i}. {'✅' if attempt.success else '❌'} {attempt.error_type.value}: {attempt.error_message[:100]}..."
+                for i, attempt in enumerate(context.attempts, 1)
+            )
         
         return "\n".join(error_summary)
     
@@ -390,11 +464,7 @@ class RetryManager:
             "tool_name": context.tool_name,
             "total_attempts": context.attempt_count,
             "total_execution_time": context.total_execution_time,
-            "success_rate": sum(1 for a in context.attempts if a.success) / max(1, context.attempt_count),
+            "success_rate": context.success_count / max(1, context.attempt_count),
             "error_types": [a.error_type.value for a in context.attempts],
-            "had_corrections": context.corrected_args is not None
+            "had_corrections": context.had_corrections
         }
-
-
-# Import asyncio for backoff delays
-import asyncio
\ No newline at end of file
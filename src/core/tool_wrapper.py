@@ -42,7 +42,8 @@ DEFAULT_CONFIG = ToolWrapperConfig()
 _retry_manager = RetryManager(
     max_attempts=DEFAULT_CONFIG.max_attempts,
     base_delay=DEFAULT_CONFIG.base_delay,
-    enable_state_management=False  # Disabled - no vector memory dependency
+    enable_state_management=False,  # Disabled - no vector memory dependency
+    track_success_details=False  # Stats are only read after retries
 )
 
 
@@ -53,7 +54,8 @@ def configure_retry_behavior(config: ToolWrapperConfig) -> None:
     _retry_manager = RetryManager(
         max_attempts=config.max_attempts,
         base_delay=config.base_delay,
-        enable_state_management=False  # Disabled - no vector memory dependency
+        enable_state_management=False,  # Disabled - no vector memory dependency
+        track_success_details=False  # Stats are only read after retries
     )
     logger.info(f"Retry behavior configured: max_attempts={config.max_attempts}, base_delay={config.base_delay}")
 
@@ -101,7 +103,8 @@ def retry_tool(
                 if inspect.iscoroutinefunction(original_func):
                     return await original_func(*args, **tool_kwargs)
                 else:
-                    return original_func(*args, **tool_kwargs)
+                    # Run blocking sync tools off the event loop so concurrent calls keep flowing
+                    return await asyncio.to_thread(original_func, *args, **tool_kwargs)
             
             # Execute with retry logic
             result, success = await _retry_manager.execute_with_retry(tool_func, context)
@@ -181,7 +184,8 @@ def simple_retry_tool(
                 if inspect.iscoroutinefunction(original_func):
                     return await original_func(*args, **tool_kwargs)
                 else:
-                    return original_func(*args, **tool_kwargs)
+                    # Run blocking sync tools off the event loop so concurrent calls keep flowing
+                    return await asyncio.to_thread(original_func, *args, **tool_kwargs)
             
             # Execute with retry logic
             result, success = await _retry_manager.execute_with_retry(tool_func, context)
@@ -274,8 +278,8 @@ class InputValidator:
                         pass
                         
             elif target_type == bool:
-                if ErrorAnalyzer._looks_like_bool(value):
-                    return ErrorAnalyzer._parse_bool(value)
+                # None for anything that isn't a boolean string, same as falling through
+                return ErrorAnalyzer._parse_bool(value)
         
         # Handle numeric conversions
         elif isinstance(value, (int, float)):
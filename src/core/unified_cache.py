@@ -9,13 +9,38 @@ import json
 import sqlite3
 import tempfile
 import logging
-from typing import Dict, Optional, Any, List, Union
-from datetime import datetime, timedelta
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Any, List, Union
+from datetime import timedelta
 from dataclasses import dataclass
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# orjson is optional: it serializes/parses cache payloads several times faster than the
+# stdlib, but the cache works the same without it
+try:
+    import orjson
+    
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    _loads = orjson.loads
+except ImportError:
+    _dumps = json.dumps
+    _loads = json.loads
+
+# Bump when the cache_entries layout changes; older cache files are rebuilt on open
+# (3: per-type row counts kept in cache_meta by triggers)
+SCHEMA_VERSION = 3
+
+
+def _now_ms() -> int:
+    """Current time as integer epoch milliseconds (the cache's timestamp format)"""
+    return time.time_ns() // 1_000_000
+
 
 class CacheStrategy(Enum):
     """Cache expiration strategies"""
@@ -26,7 +51,7 @@ class CacheStrategy(Enum):
     CUSTOM = "custom"           # Custom TTL specified
 
 
-@dataclass
+@dataclass(slots=True)
 class CacheConfig:
     """Configuration for different cache types"""
     tool_name: str
@@ -80,7 +105,9 @@ class UnifiedCache:
         """Initialize cache manager"""
         self.cache_dir = cache_dir or self._get_cache_directory()
         self.db_path = os.path.join(self.cache_dir, 'unified_cache.db')
-        self._init_database()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        # The database is opened (and its schema checked) on first use, not here
     
     def _get_cache_directory(self) -> str:
         """Get cache directory with fallback"""
@@ -99,130 +126,254 @@ class UnifiedCache:
         except (OSError, PermissionError):
             return tempfile.gettempdir()
     
-    def _get_connection(self) -> sqlite3.Connection:
-        """Get database connection with row factory"""
-        conn = sqlite3.connect(self.db_path)
+    def _connect(self) -> sqlite3.Connection:
+        """Open the shared database connection with row factory"""
+        # The shared connection is used from several threads; access is serialized by self._lock
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
         conn.row_factory = sqlite3.Row
+        # WAL lets readers proceed during a write; NORMAL sync is safe with WAL and skips
+        # most fsyncs (a crash can only lose the latest cache writes)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        # Read pages through a memory map instead of read() syscalls (up to 256 MB)
+        conn.execute('PRAGMA mmap_size=268435456')
         return conn
     
-    def _init_database(self) -> None:
-        """Initialize database schema"""
-        with self._get_connection() as conn:
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS cache_entries (
-                    cache_key TEXT PRIMARY KEY,
-                    tool_name TEXT NOT NULL,
-                    data_type TEXT NOT NULL,
-                    content TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    expires_at TEXT,
-                    metadata TEXT
-                )
-            ''')
-            
-            # Indexes for performance
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_tool_type ON cache_entries(tool_name, data_type)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_expires ON cache_entries(expires_at)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_created ON cache_entries(created_at)')
-            
-            conn.commit()
+    @contextmanager
+    def _get_connection(self) -> Iterator[sqlite3.Connection]:
+        """Use the shared database connection under the cache lock.
+        
+        Rolls back an unfinished transaction if the block raises.
+        """
+        with self._lock:
+            if self._conn is None:
+                conn = self._connect()
+                self._init_database(conn)
+                self._conn = conn
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.rollback()
+                raise
     
-    def _calculate_expires_at(self, config: CacheConfig) -> Optional[str]:
-        """Calculate expiration time based on cache strategy"""
+    def _init_database(self, conn: sqlite3.Connection) -> None:
+        """Initialize database schema on a freshly opened connection"""
+        # Drop caches written with an older layout (ISO timestamps, no row counts) so the
+        # trigger-maintained counts below start out matching the table
+        if conn.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION:
+            conn.execute('DROP TABLE IF EXISTS cache_entries')
+            conn.execute('DROP TABLE IF EXISTS cache_meta')
+        
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                cache_key TEXT PRIMARY KEY,
+                tool_name TEXT NOT NULL,
+                data_type TEXT NOT NULL,
+                content TEXT NOT NULL,
+                created_at INTEGER NOT NULL,
+                expires_at INTEGER,
+                metadata TEXT
+            )
+        ''')
+        
+        # Indexes for performance
+        # (tool_name, data_type, created_at) serves per-type lookups and the newest-first
+        # ordering used when trimming to max_entries; it supersedes the old two-column index
+        conn.execute('DROP INDEX IF EXISTS idx_tool_type')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_tool_type_created ON cache_entries(tool_name, data_type, created_at)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_expires ON cache_entries(expires_at)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_created ON cache_entries(created_at)')
+        
+        # Small key/value table for bookkeeping shared by every process using the cache file
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS cache_meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        ''')
+        
+        # Row count per (tool_name, data_type) under 'rows:<tool>/<type>', maintained in the
+        # writing transaction so the max_entries check is a primary-key lookup
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS cache_entries_count_insert AFTER INSERT ON cache_entries
+            BEGIN
+                INSERT INTO cache_meta (key, value) VALUES ('rows:' || NEW.tool_name || '/' || NEW.data_type, 1)
+                ON CONFLICT(key) DO UPDATE SET value = value + 1;
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS cache_entries_count_delete AFTER DELETE ON cache_entries
+            BEGIN
+                UPDATE cache_meta SET value = value - 1
+                WHERE key = 'rows:' || OLD.tool_name || '/' || OLD.data_type;
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS cache_entries_count_move
+            AFTER UPDATE OF tool_name, data_type ON cache_entries
+            WHEN OLD.tool_name IS NOT NEW.tool_name OR OLD.data_type IS NOT NEW.data_type
+            BEGIN
+                UPDATE cache_meta SET value = value - 1
+                WHERE key = 'rows:' || OLD.tool_name || '/' || OLD.data_type;
+                INSERT INTO cache_meta (key, value) VALUES ('rows:' || NEW.tool_name || '/' || NEW.data_type, 1)
+                ON CONFLICT(key) DO UPDATE SET value = value + 1;
+            END
+        ''')
+        conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        
+        conn.commit()
+    
+    def _calculate_expires_at(self, config: CacheConfig, now_ms: int) -> Optional[int]:
+        """Calculate expiration time (epoch ms) relative to now_ms based on cache strategy"""
         if config.strategy == CacheStrategy.PERMANENT:
             return None
         
-        now = datetime.now()
         if config.strategy == CacheStrategy.HOURLY:
-            expires = now + timedelta(hours=1)
+            ttl = timedelta(hours=1)
         elif config.strategy == CacheStrategy.DAILY:
-            expires = now + timedelta(days=1)
+            ttl = timedelta(days=1)
         elif config.strategy == CacheStrategy.WEEKLY:
-            expires = now + timedelta(weeks=1)
+            ttl = timedelta(weeks=1)
         elif config.strategy == CacheStrategy.CUSTOM:
             if config.custom_hours:
-                expires = now + timedelta(hours=config.custom_hours)
+                ttl = timedelta(hours=config.custom_hours)
             else:
-                expires = now + timedelta(hours=1)  # Default fallback
+                ttl = timedelta(hours=1)  # Default fallback
         else:
-            expires = now + timedelta(hours=1)  # Default fallback
+            ttl = timedelta(hours=1)  # Default fallback
         
-        return expires.isoformat()
+        return now_ms + int(ttl.total_seconds() * 1000)
     
     def get(self, cache_key: str, cache_type: str = "default") -> Optional[Dict]:
         """Get cached data by key"""
         try:
             with self._get_connection() as conn:
+                # Expired rows are filtered out here and left for cleanup_expired() to
+                # delete, so a read never turns into a write transaction
                 cursor = conn.execute('''
-                    SELECT content, expires_at FROM cache_entries 
-                    WHERE cache_key = ?
-                ''', (cache_key,))
+                    SELECT content FROM cache_entries 
+                    WHERE cache_key = ? AND (expires_at IS NULL OR expires_at >= ?)
+                ''', (cache_key, _now_ms()))
                 
                 row = cursor.fetchone()
                 if not row:
                     return None
                 
-                # Check expiration
-                if row['expires_at']:
-                    expires_at = datetime.fromisoformat(row['expires_at'])
-                    if datetime.now() > expires_at:
-                        # Expired - delete and return None
-                        conn.execute('DELETE FROM cache_entries WHERE cache_key = ?', (cache_key,))
-                        conn.commit()
-                        return None
-                
-                return json.loads(row['content'])
+                return _loads(row['content'])
                 
         except Exception as e:
             logger.warning(f"Failed to get cached data for {cache_key}: {e}")
             return None
     
+    def get_many(self, cache_keys: List[str]) -> Dict[str, Dict]:
+        """Get several cached entries with one query; missing or expired keys are omitted"""
+        if not cache_keys:
+            return {}
+        
+        try:
+            with self._get_connection() as conn:
+                placeholders = ', '.join('?' * len(cache_keys))
+                cursor = conn.execute(f'''
+                    SELECT cache_key, content FROM cache_entries 
+                    WHERE cache_key IN ({placeholders})
+                    AND (expires_at IS NULL OR expires_at >= ?)
+                ''', [*cache_keys, _now_ms()])
+                
+                return {row['cache_key']: _loads(row['content']) for row in cursor}
+                
+        except Exception as e:
+            logger.warning(f"Failed to get cached data for {', '.join(cache_keys)}: {e}")
+            return {}
+    
     def set(self, cache_key: str, data: Dict, cache_type: str = "default", 
             metadata: Optional[Dict] = None) -> None:
         """Set cached data with automatic TTL"""
+        self.set_many([(cache_key, data, metadata)], cache_type)
+    
+    def set_many(self, entries: List[tuple], cache_type: str = "default") -> None:
+        """Set several cached entries of one type in a single transaction
+        
+        Args:
+            entries: (cache_key, data, metadata) tuples; metadata may be None
+            cache_type: Cache type shared by all entries
+        """
+        if not entries:
+            return
+        
         try:
             config = CACHE_CONFIGS.get(cache_type)
             if not config:
                 # Default config for unknown types
                 config = CacheConfig("unknown", "data", CacheStrategy.HOURLY)
             
-            expires_at = self._calculate_expires_at(config)
-            content_json = json.dumps(data)
-            metadata_json = json.dumps(metadata) if metadata else None
-            
-            with self._get_connection() as conn:
-                conn.execute('''
-                    INSERT OR REPLACE INTO cache_entries 
-                    (cache_key, tool_name, data_type, content, created_at, expires_at, metadata)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
+            # One clock read per batch: created_at and expires_at share the same base time
+            created_at = _now_ms()
+            expires_at = self._calculate_expires_at(config, created_at)
+            rows = [
+                (
                     cache_key,
                     config.tool_name,
                     config.data_type,
-                    content_json,
-                    datetime.now().isoformat(),
+                    _dumps(data),
+                    created_at,
                     expires_at,
-                    metadata_json
-                ))
+                    _dumps(metadata) if metadata else None
+                )
+                for cache_key, data, metadata in entries
+            ]
+            
+            with self._get_connection() as conn:
+                # One commit (and one journal sync) for the whole batch. Upsert in place:
+                # INSERT OR REPLACE deletes the old row and inserts a new one, touching
+                # every index twice
+                conn.executemany('''
+                    INSERT INTO cache_entries 
+                    (cache_key, tool_name, data_type, content, created_at, expires_at, metadata)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(cache_key) DO UPDATE SET
+                        tool_name = excluded.tool_name,
+                        data_type = excluded.data_type,
+                        content = excluded.content,
+                        created_at = excluded.created_at,
+                        expires_at = excluded.expires_at,
+                        metadata = excluded.metadata
+                ''', rows)
                 
-                # Cleanup old entries if there's a max_entries limit
-                if config.max_entries:
+                # Cleanup old entries if there's a max_entries limit. The trim walks the
+                # type's index, so it only runs once the type is max_entries // 10 rows over
+                # its cap; the cap may be overshot by that much
+                if config.max_entries and self._trim_due(conn, config):
+                    # Walk the (tool_name, data_type, created_at) index newest-first (rowid breaks
+                    # same-millisecond ties) and delete whatever lies past the first max_entries rows
                     conn.execute('''
                         DELETE FROM cache_entries 
-                        WHERE tool_name = ? AND data_type = ? 
-                        AND cache_key NOT IN (
-                            SELECT cache_key FROM cache_entries 
+                        WHERE rowid IN (
+                            SELECT rowid FROM cache_entries 
                             WHERE tool_name = ? AND data_type = ?
-                            ORDER BY created_at DESC 
-                            LIMIT ?
+                            ORDER BY created_at DESC, rowid DESC
+                            LIMIT -1 OFFSET ?
                         )
-                    ''', (config.tool_name, config.data_type, 
-                          config.tool_name, config.data_type, config.max_entries))
+                    ''', (config.tool_name, config.data_type, config.max_entries))
                 
                 conn.commit()
                 
         except Exception as e:
-            logger.warning(f"Failed to cache data for {cache_key}: {e}")
+            keys = ', '.join(entry[0] for entry in entries)
+            logger.warning(f"Failed to cache data for {keys}: {e}")
+    
+    def _trim_due(self, conn: sqlite3.Connection, config: CacheConfig) -> bool:
+        """Report whether a size-capped type has grown far enough past its cap to trim.
+        
+        Reads the row count the cache_entries triggers keep in cache_meta - a primary-key
+        lookup rather than a count over the type's index. Being stored in the database, it
+        holds across processes (the app starts a fresh MCP server process per tool call).
+        """
+        row = conn.execute(
+            'SELECT value FROM cache_meta WHERE key = ?',
+            (f'rows:{config.tool_name}/{config.data_type}',)
+        ).fetchone()
+        return row is not None and row[0] >= config.max_entries + max(1, config.max_entries // 10)
     
     def find_related(self, tool_name: str, data_type: str, search_term: str) -> List[Dict]:
         """Find related cached entries for smart query optimization"""
@@ -238,7 +389,7 @@ class UnifiedCache:
                 ''', (
                     tool_name, data_type, 
                     f'%{search_term}%', f'%{search_term}%',
-                    datetime.now().isoformat()
+                    _now_ms()
                 ))
                 
                 results = []
@@ -246,8 +397,8 @@ class UnifiedCache:
                     try:
                         results.append({
                             'cache_key': row['cache_key'],
-                            'content': json.loads(row['content']),
-                            'metadata': json.loads(row['metadata']) if row['metadata'] else {}
+                            'content': _loads(row['content']),
+                            'metadata': _loads(row['metadata']) if row['metadata'] else {}
                         })
                     except json.JSONDecodeError:
                         continue
@@ -262,31 +413,65 @@ class UnifiedCache:
         """Remove expired entries and return count removed"""
         try:
             with self._get_connection() as conn:
-                cursor = conn.execute('''
-                    DELETE FROM cache_entries 
-                    WHERE expires_at IS NOT NULL AND expires_at < ?
-                ''', (datetime.now().isoformat(),))
+                return self._delete_expired(conn, _now_ms())
                 
-                removed = cursor.rowcount
+        except Exception as e:
+            logger.warning(f"Failed to cleanup expired entries: {e}")
+            return 0
+    
+    def cleanup_expired_if_due(self, min_interval_seconds: float) -> int:
+        """Remove expired entries unless any process did so within min_interval_seconds.
+        
+        Runs on its own connection, outside the cache lock, so tool reads on the shared
+        connection don't wait for it (WAL lets them read during the DELETE). The time of the
+        last cleanup is kept in the database, since the app starts a fresh MCP server process
+        per tool call and an in-process timestamp would never throttle anything.
+        """
+        conn = None
+        try:
+            conn = self._connect()
+            self._init_database(conn)
+            now = _now_ms()
+            # Claim the cleanup slot atomically: only one process wins per interval
+            claimed = conn.execute('''
+                INSERT INTO cache_meta (key, value) VALUES ('last_cleanup', ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value
+                WHERE cache_meta.value <= ?
+            ''', (now, now - int(min_interval_seconds * 1000))).rowcount
+            if not claimed:
                 conn.commit()
-                
-                if removed > 0:
-                    logger.info(f"Cleaned up {removed} expired cache entries")
-                
-                return removed
-                
+                return 0
+            return self._delete_expired(conn, now)
+            
         except Exception as e:
             logger.warning(f"Failed to cleanup expired entries: {e}")
             return 0
+        finally:
+            if conn is not None:
+                conn.close()
+    
+    def _delete_expired(self, conn: sqlite3.Connection, now_ms: int) -> int:
+        """Delete entries that expired before now_ms and commit; returns count removed"""
+        cursor = conn.execute('''
+            DELETE FROM cache_entries 
+            WHERE expires_at IS NOT NULL AND expires_at < ?
+        ''', (now_ms,))
+        
+        removed = cursor.rowcount
+        conn.commit()
+        
+        if removed > 0:
+            logger.info(f"Cleaned up {removed} expired cache entries")
+        
+        return removed
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
         try:
             with self._get_connection() as conn:
-                # Total entries
-                total = conn.execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0]
-                
-                # By tool
+                # By tool - one pass over the (tool_name, data_type, created_at) index;
+                # the total is summed from these counts instead of a second COUNT(*) scan
+                total = 0
                 by_tool = {}
                 cursor = conn.execute('''
                     SELECT tool_name, data_type, COUNT(*) as count 
@@ -294,14 +479,15 @@ class UnifiedCache:
                     GROUP BY tool_name, data_type
                 ''')
                 
-                for row in cursor.fetchall():
-                    tool = row['tool_name']
-                    if tool not in by_tool:
-                        by_tool[tool] = {}
-                    by_tool[tool][row['data_type']] = row['count']
+                for row in cursor:
+                    by_tool.setdefault(row['tool_name'], {})[row['data_type']] = row['count']
+                    total += row['count']
                 
-                # Database size
-                db_size = os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0
+                # Database size (one stat call rather than exists() + getsize())
+                try:
+                    db_size = os.stat(self.db_path).st_size
+                except FileNotFoundError:
+                    db_size = 0
                 
                 return {
                     'total_entries': total,
@@ -333,22 +519,74 @@ class UnifiedCache:
             return 0
 
 
-# Global cache instance
-cache = UnifiedCache()
+# Global cache instance, created on first use so importing this module doesn't touch
+# the filesystem or open the database
+_cache: Optional[UnifiedCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> UnifiedCache:
+    """Get the shared cache instance, creating it on first call"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = UnifiedCache()
+    return _cache
 
 
 # Convenience functions for backward compatibility
 def get_cached_data(cache_key: str, cache_type: str = "default") -> Optional[Dict]:
     """Get cached data - backward compatible function"""
-    return cache.get(cache_key, cache_type)
+    return get_cache().get(cache_key, cache_type)
+
+
+def get_cached_data_many(cache_keys: List[str]) -> Dict[str, Dict]:
+    """Get several cached entries in one query, keyed by cache key"""
+    return get_cache().get_many(cache_keys)
 
 
 def save_cached_data(cache_key: str, data: Dict, cache_type: str = "default", 
                     metadata: Optional[Dict] = None) -> None:
     """Save data to cache - backward compatible function"""
-    cache.set(cache_key, data, cache_type, metadata)
+    get_cache().set(cache_key, data, cache_type, metadata)
+
+
+def save_cached_data_many(entries: List[tuple], cache_type: str = "default") -> None:
+    """Save several (cache_key, data, metadata) entries of one type in one transaction"""
+    get_cache().set_many(entries, cache_type)
 
 
 def cleanup_cache() -> int:
     """Clean up expired cache entries"""
-    return cache.cleanup_expired()
\ No newline at end of file
+    return get_cache().cleanup_expired()
+
+
+# Minimum time between background cleanups started by schedule_cleanup()
+CLEANUP_INTERVAL_SECONDS = 3600
+
+_cleanup_lock = threading.Lock()
+_last_cleanup: Optional[float] = None
+
+
+def schedule_cleanup() -> None:
+    """Clean up expired entries in a background thread, at most once per CLEANUP_INTERVAL_SECONDS.
+    
+    Cheap enough to call at the start of every tool invocation. The cleanup uses its own
+    connection, so the caller's cache reads don't wait on it (a concurrent cache write may
+    wait for its commit). The interval is enforced across processes through the database;
+    the in-process timestamp only saves starting a thread that would find nothing to do.
+    """
+    global _last_cleanup
+    with _cleanup_lock:
+        now = time.monotonic()
+        if _last_cleanup is not None and now - _last_cleanup < CLEANUP_INTERVAL_SECONDS:
+            return
+        _last_cleanup = now
+    
+    threading.Thread(
+        target=get_cache().cleanup_expired_if_due,
+        args=(CLEANUP_INTERVAL_SECONDS,),
+        name="cache-cleanup",
+        daemon=True
+    ).start()
@@ -2,11 +2,76 @@
 General utility functions for MCP tools
 """
 
+import re
 import logging
+from functools import lru_cache
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Literal keywords that every sponsor pattern below requires; a transcript containing none of
+# them can skip the regex pass entirely
+_SPONSOR_TRIGGERS = (
+    "sponsor", "brought to you by", "special thanks to", "speaking of",
+    "skillshare", "nordvpn", "squarespace", "brilliant", "audible", "honey",
+    "raid shadow legends", "subscribe", "smash that like button", "merch",
+    "link in the description", "patreon",
+)
+
+_WS_RE = re.compile(r'\s+')
+
+# YouTube URL patterns - comprehensive to handle all parameters including playlists.
+# Compiled once at import; tried in order since the first match wins
+_VIDEO_ID_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    # Standard watch URLs with any parameters (timestamps, playlists, etc.)
+    r'youtube\.com/watch\?.*[?&]?v=([a-zA-Z0-9_-]{11})',
+    # Playlist URLs - extract video ID while ignoring list/index parameters
+    r'youtube\.com/watch\?.*v=([a-zA-Z0-9_-]{11}).*(?:&list=|&index=)',
+    # Short URLs
+    r'youtu\.be/([a-zA-Z0-9_-]{11})',
+    # Embed URLs
+    r'youtube\.com/embed/([a-zA-Z0-9_-]{11})',
+    # Mobile URLs
+    r'youtube\.com/v/([a-zA-Z0-9_-]{11})',
+    # Share URLs with parameters
+    r'youtube\.com/.*[?&]v=([a-zA-Z0-9_-]{11})',
+))
+
+# Common patterns for sponsor/ad content, applied in order (case insensitive)
+_SPONSOR_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    # Sponsor mentions
+    r'this video is sponsored by[^.]*\.',
+    r'our sponsor[^.]*\.',
+    r'today\'?s sponsor[^.]*\.',
+    r'brought to you by[^.]*\.',
+    r'special thanks to[^.]*\.',
+    r'thanks to.*?for sponsoring[^.]*\.',
+
+    # Common sponsor transitions
+    r'but first[^.]*sponsor[^.]*\.',
+    r'before we get started[^.]*sponsor[^.]*\.',
+    r'speaking of[^.]*\.',
+
+    # Skillshare/common sponsors
+    r'skillshare[^.]*\.',
+    r'nordvpn[^.]*\.',
+    r'squarespace[^.]*\.',
+    r'brilliant[^.]*\.',
+    r'audible[^.]*\.',
+    r'honey[^.]*\.',
+    r'raid shadow legends[^.]*\.',
+
+    # Subscribe/like requests (often clustered with ads)
+    r'don\'?t forget to like and subscribe[^.]*\.',
+    r'if you enjoyed this video[^.]*subscribe[^.]*\.',
+    r'smash that like button[^.]*\.',
+
+    # Merchandise/channel promotion
+    r'check out my merch[^.]*\.',
+    r'link in the description[^.]*\.',
+    r'patreon[^.]*\.',
+))
+
 
 def clean_markdown_text(text: str) -> str:
     """Clean text to prevent overly long sections and problematic headers"""
@@ -26,34 +91,21 @@ def clean_markdown_text(text: str) -> str:
     return text
 
 
+@lru_cache(maxsize=256)
 def extract_video_id(url: str) -> Optional[str]:
-    """Extract YouTube video ID from various URL formats and clean parameters"""
-    import re
+    """Extract YouTube video ID from various URL formats and clean parameters.
     
+    Memoized: the same URL is typically parsed again on retries and repeat questions.
+    """
     # Clean up common URL issues (remove extra spaces, fix protocols)
     url = url.strip()
     if not url.startswith(('http://', 'https://')):
         if url.startswith('www.') or url.startswith('youtube.') or url.startswith('youtu.be'):
             url = 'https://' + url
     
-    # YouTube URL patterns - comprehensive to handle all parameters including playlists
-    patterns = [
-        # Standard watch URLs with any parameters (timestamps, playlists, etc.)
-        r'youtube\.com/watch\?.*[?&]?v=([a-zA-Z0-9_-]{11})',
-        # Playlist URLs - extract video ID while ignoring list/index parameters
-        r'youtube\.com/watch\?.*v=([a-zA-Z0-9_-]{11}).*(?:&list=|&index=)',
-        # Short URLs
-        r'youtu\.be/([a-zA-Z0-9_-]{11})',
-        # Embed URLs
-        r'youtube\.com/embed/([a-zA-Z0-9_-]{11})',
-        # Mobile URLs
-        r'youtube\.com/v/([a-zA-Z0-9_-]{11})',
-        # Share URLs with parameters
-        r'youtube\.com/.*[?&]v=([a-zA-Z0-9_-]{11})',
-    ]
     
-    for pattern in patterns:
-        match = re.search(pattern, url)
+    for pattern in _VIDEO_ID_PATTERNS:
+        match = pattern.search(url)
         if match:
             return match.group(1)
     
@@ -62,50 +114,19 @@ def extract_video_id(url: str) -> Optional[str]:
 
 def filter_sponsor_content(transcript_text: str) -> str:
     """Remove sponsor segments and promotional content from transcript"""
-    import re
+    # Most transcripts mention no sponsor at all - only collapse whitespace for those
+    lowered = transcript_text.lower()
+    if not any(keyword in lowered for keyword in _SPONSOR_TRIGGERS):
+        return _WS_RE.sub(' ', transcript_text).strip()
     
-    # Common patterns for sponsor/ad content
-    sponsor_patterns = [
-        # Sponsor mentions
-        r'this video is sponsored by[^.]*\.',
-        r'our sponsor[^.]*\.',
-        r'today\'?s sponsor[^.]*\.',
-        r'brought to you by[^.]*\.',
-        r'special thanks to[^.]*\.',
-        r'thanks to.*?for sponsoring[^.]*\.',
-        
-        # Common sponsor transitions
-        r'but first[^.]*sponsor[^.]*\.',
-        r'before we get started[^.]*sponsor[^.]*\.',
-        r'speaking of[^.]*\.',
-        
-        # Skillshare/common sponsors
-        r'skillshare[^.]*\.',
-        r'nordvpn[^.]*\.',
-        r'squarespace[^.]*\.',
-        r'brilliant[^.]*\.',
-        r'audible[^.]*\.',
-        r'honey[^.]*\.',
-        r'raid shadow legends[^.]*\.',
-        
-        # Subscribe/like requests (often clustered with ads)
-        r'don\'?t forget to like and subscribe[^.]*\.',
-        r'if you enjoyed this video[^.]*subscribe[^.]*\.',
-        r'smash that like button[^.]*\.',
-        
-        # Merchandise/channel promotion
-        r'check out my merch[^.]*\.',
-        r'link in the description[^.]*\.',
-        r'patreon[^.]*\.',
-    ]
     
     # Apply filters (case insensitive)
     filtered_text = transcript_text
-    for pattern in sponsor_patterns:
-        filtered_text = re.sub(pattern, '', filtered_text, flags=re.IGNORECASE)
+    for pattern in _SPONSOR_PATTERNS:
+        filtered_text = pattern.sub('', filtered_text)
     
     # Remove multiple spaces and clean up
-    filtered_text = re.sub(r'\s+', ' ', filtered_text)
+    filtered_text = _WS_RE.sub(' ', filtered_text)
     filtered_text = filtered_text.strip()
     
     return filtered_text
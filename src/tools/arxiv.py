@@ -3,8 +3,10 @@ arXiv search and academic paper analysis tools
 """
 
 import os
+import heapq
 import tempfile
 import logging
+from operator import itemgetter
 from typing import List, Optional
 from datetime import datetime
 
@@ -15,6 +17,12 @@ from fastmcp.tools.tool import ToolResult
 
 logger = logging.getLogger(__name__)
 
+# Categories that get a small relevance boost when ranking search results
+RELEVANT_CATEGORIES = frozenset({'cs.LG', 'cs.AI', 'cs.CV', 'cs.CL', 'stat.ML', 'cs.IR'})
+
+# arXiv query field specifiers; queries that already use one are passed through as-is
+FIELD_SPECIFIERS = ('ti:', 'abs:', 'au:', 'cat:')
+
 
 def register_arxiv_tools(mcp: FastMCP):
     """Register arXiv-related tools with the MCP server"""
@@ -25,7 +33,7 @@ def register_arxiv_tools(mcp: FastMCP):
         query = query.lower().strip()
         
         # If query already has field specifiers, use as-is
-        if any(field in query for field in ['ti:', 'abs:', 'au:', 'cat:']):
+        if any(field in query for field in FIELD_SPECIFIERS):
             return query
         
         # If query is very long (like paper titles), use as-is but quoted
@@ -60,15 +68,14 @@ def register_arxiv_tools(mcp: FastMCP):
             score = title_matches * 3 + abstract_matches
             
             # Boost score for papers in relevant categories
-            relevant_categories = ['cs.LG', 'cs.AI', 'cs.CV', 'cs.CL', 'stat.ML', 'cs.IR']
-            if any(cat in paper.categories for cat in relevant_categories):
+            if not RELEVANT_CATEGORIES.isdisjoint(paper.categories):
                 score += 1
                 
             scored_results.append((score, paper))
         
-        # Sort by score and return top results
-        scored_results.sort(key=lambda x: x[0], reverse=True)
-        return [paper for score, paper in scored_results[:max_results] if score > 0]
+        # Select the top results by score without sorting the whole candidate list
+        top_results = heapq.nlargest(max_results, scored_results, key=itemgetter(0))
+        return [paper for score, paper in top_results if score > 0]
     
     def _extract_paper_text(pdf_url: str) -> Optional[str]:
         """Extract raw text content from arXiv PDF for host LLM analysis"""
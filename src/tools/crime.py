@@ -2,13 +2,14 @@
 Toronto crime statistics tools using the Toronto Open Data API
 """
 
+import heapq
 import logging
 import tempfile
 from datetime import datetime
 from typing import Optional, Dict, List
 from fastmcp import FastMCP
 from fastmcp.tools.tool import ToolResult
-from ..core.unified_cache import get_cached_data, save_cached_data, cleanup_cache
+from ..core.unified_cache import get_cached_data, save_cached_data, schedule_cleanup
 from ..core.mcp_output import create_summary_and_chart_result, extract_chart_from_matplotlib, create_text_content
 
 logger = logging.getLogger(__name__)
@@ -32,7 +33,7 @@ def register_crime_tools(mcp: FastMCP):
             import matplotlib.pyplot as plt
             
             # Clean up old cache periodically
-            cleanup_old_cache()
+            schedule_cleanup()
             
             # Base URL for Toronto Open Data API
             base_url = "https://ckan0.cf.opendata.inter.prod-toronto.ca"
@@ -60,6 +61,11 @@ def register_crime_tools(mcp: FastMCP):
             
             crime_prefix = crime_map[crime_type.lower()]
             
+            # An empty name can't match anything - answer before loading the dataset
+            neighbourhood = (neighbourhood or "").strip()
+            if not neighbourhood:
+                return ToolResult(content=[create_text_content("❌ Please provide a neighbourhood name. Use the 'list_toronto_neighbourhoods' tool to see all available neighbourhood names.")])
+            
             # Check cache first for full dataset
             cache_key = f"crime_data_toronto"
             cached_data = get_cached_data(cache_key, "crime_data")
@@ -119,9 +125,9 @@ def register_crime_tools(mcp: FastMCP):
                 neighbourhood_match = _find_neighbourhood_string(crime_data, neighbourhood)
                 if not neighbourhood_match:
                     # Show available neighbourhoods that partially match using string search
-                    partial_matches = _get_partial_matches(crime_data, neighbourhood)
+                    partial_matches = _get_partial_matches(crime_data, neighbourhood, limit=5)
                     if partial_matches:
-                        matches_str = ", ".join(partial_matches[:5])  # Show first 5 matches
+                        matches_str = ", ".join(partial_matches)
                         return ToolResult(content=[create_text_content(f"❌ Neighbourhood '{neighbourhood}' not found. Did you mean: {matches_str}?")])
                     else:
                         return ToolResult(content=[create_text_content(f"❌ Neighbourhood '{neighbourhood}' not found. Use the 'list_toronto_neighbourhoods' tool to see all available neighbourhood names, or try names like 'Waterfront', 'Downtown', 'Harbourfront'.")])
@@ -151,7 +157,7 @@ def register_crime_tools(mcp: FastMCP):
             import requests
             
             # Clean up old cache periodically
-            cleanup_old_cache()
+            schedule_cleanup()
             
             # Base URL for Toronto Open Data API
             base_url = "https://ckan0.cf.opendata.inter.prod-toronto.ca"
@@ -243,24 +249,26 @@ def register_crime_tools(mcp: FastMCP):
 
 def _find_neighbourhood_string(crime_data: List[Dict], query: str) -> Optional[Dict]:
     """Fallback string-based neighbourhood matching"""
-    query_lower = query.lower()
+    query_lower = query.strip().lower()
+    if not query_lower:
+        return None
+    
+    # Lowercase each area name once and reuse it across the three matching passes
+    named_records = [(record.get('AREA_NAME', '').lower(), record) for record in crime_data]
     
     # First try exact match
-    for record in crime_data:
-        area_name = record.get('AREA_NAME', '').lower()
+    for area_name, record in named_records:
         if area_name == query_lower:
             return record
     
     # Then try partial match
-    for record in crime_data:
-        area_name = record.get('AREA_NAME', '').lower()
+    for area_name, record in named_records:
         if query_lower in area_name or area_name.startswith(query_lower):
             return record
     
     # Finally try substring search for flexible matching
-    for record in crime_data:
-        area_name = record.get('AREA_NAME', '').lower()
-        query_words = query_lower.split()
+    query_words = query_lower.split()
+    for area_name, record in named_records:
         if all(word in area_name for word in query_words):
             return record
     
@@ -288,9 +296,12 @@ def _cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
         return 0
 
 
-def _get_partial_matches(crime_data: List[Dict], query: str) -> List[str]:
-    """Get partial matches for neighbourhood suggestions"""
+def _get_partial_matches(crime_data: List[Dict], query: str, limit: int = 5) -> List[str]:
+    """Get the first `limit` partial matches (alphabetically) for neighbourhood suggestions"""
     query_lower = query.lower()
+    query_words = query_lower.split()
+    if not query_words:
+        return []
     matches = []
     
     for record in crime_data:
@@ -298,11 +309,11 @@ def _get_partial_matches(crime_data: List[Dict], query: str) -> List[str]:
         area_lower = area_name.lower()
         
         # Check if any word in query appears in area name
-        query_words = query_lower.split()
         if any(word in area_lower for word in query_words):
             matches.append(area_name)
     
-    return sorted(list(set(matches)))  # Remove duplicates and sort
+    # Remove duplicates and take the alphabetically first few without sorting them all
+    return heapq.nsmallest(limit, set(matches))
 
 
 def _extract_crime_stats(neighbourhood_data: Dict, crime_prefix: str) -> Optional[Dict]:
@@ -3,12 +3,12 @@ Consolidated financial data tool for stocks, cryptocurrency, and market data
 """
 
 import logging
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 from fastmcp import FastMCP
 from fastmcp.tools.tool import ToolResult
-from ..core.unified_cache import get_cached_data, save_cached_data, cleanup_cache
+from ..core.unified_cache import get_cached_data, get_cached_data_many, save_cached_data, save_cached_data_many, schedule_cleanup
 from ..core.mcp_output import create_summary_and_chart_result, extract_chart_from_matplotlib
 
 logger = logging.getLogger(__name__)
@@ -18,6 +18,9 @@ YAHOO_HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
 }
 
+# Symbols quoted against USD as crypto pairs (e.g. BTC -> BTC-USD)
+CRYPTO_SYMBOLS = frozenset({'BTC', 'ETH', 'ADA', 'DOT', 'LINK', 'LTC', 'XRP', 'DOGE', 'MATIC', 'SOL'})
+
 
 def register_financial_tools(mcp: FastMCP):
     """Register financial-related tools with the MCP server"""
@@ -30,21 +33,32 @@ def register_financial_tools(mcp: FastMCP):
             symbol: Stock symbol, crypto symbol, or market index (e.g., "AAPL", "BTC", "SPY")
         """
         try:
-            cleanup_cache()
+            schedule_cleanup()
             
             # Format symbol and detect asset type
             formatted_symbol, asset_type = _format_symbol(symbol)
             
+            # Look up all three cached pieces (quote, 1-month and 1-year history) in one query
+            cached_entries = get_cached_data_many([
+                f"stock_current_{formatted_symbol}",
+                f"stock_history_{formatted_symbol}_1mo",
+                f"stock_history_{formatted_symbol}_1y",
+            ])
+            
             # Get current market data
-            quote_data = _get_current_data(formatted_symbol)
+            quote_data = _get_current_data(formatted_symbol, cached_entries)
             if not quote_data:
                 from ..core.mcp_output import create_text_content
                 from mcp.types import TextContent
                 return ToolResult(content=[create_text_content(f"❌ Could not find data for symbol: {symbol}")])
             
-            # Get historical data (1-month and 1-year)
-            hist_data = _get_historical_data(formatted_symbol, "1mo")
-            year_data = _get_historical_data(formatted_symbol, "1y", year_only=True)
+            # Get historical data (1-month and 1-year); fresh fetches are written back together
+            history_writes: List[tuple] = []
+            hist_data = _get_historical_data(formatted_symbol, "1mo", cached_entries=cached_entries,
+                                             pending_writes=history_writes)
+            year_data = _get_historical_data(formatted_symbol, "1y", year_only=True, cached_entries=cached_entries,
+                                             pending_writes=history_writes)
+            save_cached_data_many(history_writes, "stock_history")
             
             # Format and return the output with proper content blocks
             asset_name = _get_asset_name(symbol, asset_type, quote_data)
@@ -58,18 +72,21 @@ def register_financial_tools(mcp: FastMCP):
 
 def _format_symbol(symbol: str) -> Tuple[str, str]:
     """Format symbol for Yahoo Finance and detect asset type"""
-    crypto_symbols = ['BTC', 'ETH', 'ADA', 'DOT', 'LINK', 'LTC', 'XRP', 'DOGE', 'MATIC', 'SOL']
+    symbol = symbol.upper()
     
-    if symbol.upper() in crypto_symbols:
-        return f"{symbol.upper()}-USD", "crypto"
+    if symbol in CRYPTO_SYMBOLS:
+        return f"{symbol}-USD", "crypto"
     else:
-        return symbol.upper(), "stock"
+        return symbol, "stock"
 
 
-def _get_current_data(formatted_symbol: str) -> Optional[Dict]:
-    """Get current market data with caching"""
+def _get_current_data(formatted_symbol: str, cached_entries: Optional[Dict[str, Dict]] = None) -> Optional[Dict]:
+    """Get current market data with caching (cached_entries: prefetched get_cached_data_many result)"""
     cache_key = f"stock_current_{formatted_symbol}"
-    cached_data = get_cached_data(cache_key, "stock_current")
+    if cached_entries is not None:
+        cached_data = cached_entries.get(cache_key)
+    else:
+        cached_data = get_cached_data(cache_key, "stock_current")
     
     if cached_data and 'quote' in cached_data:
         return cached_data['quote']
@@ -99,11 +116,17 @@ def _get_current_data(formatted_symbol: str) -> Optional[Dict]:
     return quote_data
 
 
-def _get_historical_data(formatted_symbol: str, range_param: str, year_only: bool = False) -> Optional[Dict]:
-    """Get historical data with caching"""
+def _get_historical_data(formatted_symbol: str, range_param: str, year_only: bool = False,
+                         cached_entries: Optional[Dict[str, Dict]] = None,
+                         pending_writes: Optional[List[tuple]] = None) -> Optional[Dict]:
+    """Get historical data with caching (cached_entries: prefetched get_cached_data_many result;
+    pending_writes: collect the cache entry for a later save_cached_data_many instead of saving it)"""
     cache_key = f"stock_history_{formatted_symbol}_{range_param}"
     cache_type = 'year_data' if year_only else 'history'
-    cached_data = get_cached_data(cache_key, "stock_history")
+    if cached_entries is not None:
+        cached_data = cached_entries.get(cache_key)
+    else:
+        cached_data = get_cached_data(cache_key, "stock_history")
     
     if cached_data and cache_type in cached_data:
         return cached_data[cache_type]
@@ -148,7 +171,11 @@ def _get_historical_data(formatted_symbol: str, range_param: str, year_only: boo
             'price_data': valid_data
         }
     
-    save_cached_data(cache_key, {cache_type: hist_data}, "stock_history", {'symbol': formatted_symbol, 'range': range_param})
+    entry = (cache_key, {cache_type: hist_data}, {'symbol': formatted_symbol, 'range': range_param})
+    if pending_writes is not None:
+        pending_writes.append(entry)
+    else:
+        save_cached_data_many([entry], "stock_history")
     return hist_data
 
 
@@ -3,6 +3,7 @@ Statistics Canada economic data tools for CPI, GDP, and employment data
 """
 
 import logging
+import time
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import requests
@@ -12,7 +13,7 @@ import asyncio
 from concurrent.futures import ThreadPoolExecutor
 
 from fastmcp import FastMCP
-from ..core.unified_cache import get_cached_data, save_cached_data, cleanup_cache
+from ..core.unified_cache import get_cached_data, save_cached_data, schedule_cleanup
 from ..core.mcp_output import create_text_result
 from fastmcp.tools.tool import ToolResult
 
@@ -88,7 +89,7 @@ EMPLOYMENT_VECTORS = {
     }
 }
 
-@dataclass
+@dataclass(slots=True)
 class EconomicIndicator:
     """Data class for economic indicators"""
     name: str
@@ -119,7 +120,7 @@ class EconomicIndicator:
         return cls(**data)
 
 
-@dataclass
+@dataclass(slots=True)
 class CanadianEconomicData:
     """Consolidated Canadian economic data"""
     cpi: Optional[EconomicIndicator]
@@ -158,7 +159,7 @@ def register_statscan_tools(mcp: FastMCP):
             focus: Analysis focus - "overview" (default), "inflation", "growth", "employment", or "detailed"
         """
         try:
-            cleanup_old_cache()
+            schedule_cleanup()
             
             # Get all economic indicators concurrently
             economic_data = _get_all_economic_data()
@@ -669,15 +670,15 @@ def _load_statscan_cache(cache_key: str, cache_hours: int = 24) -> Optional[Dict
     """Load cached Statistics Canada data if still valid"""
     try:
         # Use existing cache but with custom TTL logic
-        cached_data = load_cached_data(cache_key)
+        cached_data = get_cached_data(cache_key)
         if not cached_data:
             return None
             
-        # Check if cache is still valid based on custom hours
+        # Check if cache is still valid based on custom hours (cached_at is epoch seconds;
+        # entries from before that change carry an ISO string and are simply refetched)
         cached_at = cached_data.get('cached_at')
-        if cached_at:
-            cached_time = datetime.fromisoformat(cached_at)
-            if datetime.now() - cached_time < timedelta(hours=cache_hours):
+        if isinstance(cached_at, (int, float)):
+            if time.time() - cached_at < cache_hours * 3600:
                 return cached_data
         
         return None
@@ -689,7 +690,7 @@ def _load_statscan_cache(cache_key: str, cache_hours: int = 24) -> Optional[Dict
 def _save_statscan_cache(cache_key: str, data: Dict) -> None:
     """Save Statistics Canada data to cache with timestamp"""
     try:
-        data['cached_at'] = datetime.now().isoformat()
+        data['cached_at'] = time.time()
         save_cached_data(cache_key, data)
     except Exception as e:
         logger.warning(f"Failed to cache data for {cache_key}: {e}")
@@ -3,6 +3,7 @@ Weather and location tools
 """
 
 import logging
+import time
 from typing import Optional, Dict
 from datetime import datetime
 
@@ -120,10 +121,11 @@ def register_weather_tools(mcp: FastMCP):
             cache_key = f"weather_{latitude:.2f}_{longitude:.2f}"
             cached_data = get_cached_data(cache_key, "weather_data")
             if cached_data:
-                # Check if data is less than 30 minutes old
-                from datetime import timedelta
-                if datetime.now() - datetime.fromisoformat(cached_data['timestamp']) < timedelta(minutes=30):
-                    return create_text_result(cached_data['weather_data'])
+                # Check if data is less than 30 minutes old (timestamp is epoch seconds;
+                # entries from before that change carry an ISO string and are simply refetched)
+                cached_at = cached_data.get('timestamp')
+                if isinstance(cached_at, (int, float)) and time.time() - cached_at < 30 * 60:
+                    return cached_data['weather_data']
             
             # Open-Meteo API - free, no auth, 10k requests/day
             url = "https://api.open-meteo.com/v1/forecast"
@@ -143,7 +145,7 @@ def register_weather_tools(mcp: FastMCP):
                 # Cache the weather data
                 cache_data = {
                     'weather_data': weather_data,
-                    'timestamp': datetime.now().isoformat(),
+                    'timestamp': time.time(),
                     'latitude': latitude,
                     'longitude': longitude
                 }
@@ -16,6 +16,12 @@ from ..core.unified_cache import get_cached_data, save_cached_data
 from ..core.mcp_output import create_text_result
 from fastmcp.tools.tool import ToolResult
 
+# URL schemes accepted by the web tools
+ALLOWED_SCHEMES = frozenset({'http', 'https'})
+
+# Tags treated as the page's primary content container
+MAIN_CONTENT_TAGS = frozenset({'main', 'article'})
+
 def _validate_url(url: str) -> Tuple[bool, str, Optional[str]]:
     """
     Validate URL format and return validation result.
@@ -35,7 +41,7 @@ def _validate_url(url: str) -> Tuple[bool, str, Optional[str]]:
     if not parsed.scheme:
         return False, "", "Error: URL must include protocol (http:// or https://)"
     
-    if parsed.scheme not in ['http', 'https']:
+    if parsed.scheme not in ALLOWED_SCHEMES:
         return False, "", "Error: Only HTTP and HTTPS URLs are supported"
     
     if not parsed.netloc:
@@ -242,7 +248,7 @@ def _extract_clean_content(soup) -> Tuple[str, Dict[str, Any]]:
         'estimated_reading_time_minutes': reading_time,
         'heading_count': len(headings),
         'headings': headings[:10],  # First 10 headings
-        'has_main_content_area': main_content is not None and main_content.name in ['main', 'article']
+        'has_main_content_area': main_content is not None and main_content.name in MAIN_CONTENT_TAGS
     }
     
     return clean_content, content_stats
@@ -276,18 +282,21 @@ def register_web_tools(mcp: FastMCP):
             
             # Initialize DDGS with timeout (headers no longer supported in ddgs package)
             ddgs = DDGS(timeout=20)
-            results = list(ddgs.text(query, max_results=max_results))
             
-            if not results:
+            # Format results as markdown while the generator yields them
+            formatted_parts = [f"#### Search Results for: {query}\n\n"]
+            for i, result in enumerate(ddgs.text(query, max_results=max_results), 1):
+                formatted_parts.append(
+                    f"**{i}. {result.get('title', 'No Title')}**\n"
+                    f"**URL**: {result.get('href', 'No URL')}\n"
+                    f"**Summary**: {result.get('body', 'No description available')}\n\n"
+                    "---\n\n"
+                )
+            
+            if len(formatted_parts) == 1:
                 return create_text_result(f"No search results found for: {query}")
             
-            # Format results as markdown
-            formatted_results = f"#### Search Results for: {query}\n\n"
-            for i, result in enumerate(results, 1):
-                formatted_results += f"**{i}. {result.get('title', 'No Title')}**\n"
-                formatted_results += f"**URL**: {result.get('href', 'No URL')}\n"
-                formatted_results += f"**Summary**: {result.get('body', 'No description available')}\n\n"
-                formatted_results += "---\n\n"
+            formatted_results = ''.join(formatted_parts)
             
             # Cache the results
             save_cached_data(cache_key, {'results': formatted_results}, "web_search", {'query': query, 'max_results': max_results})
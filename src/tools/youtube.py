@@ -19,6 +19,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Substrings that mark a URL as YouTube (m.youtube.com and www.youtube.com contain youtube.com)
+YOUTUBE_DOMAINS = ('youtube.com', 'youtu.be')
+
 
 def get_webshare_proxy():
     """Get a random WebShare proxy from environment variables"""
@@ -82,26 +85,20 @@ def register_youtube_tools(mcp: FastMCP):
             
             # Basic YouTube URL validation
             url = url.strip()
-            if not any(domain in url for domain in ['youtube.com', 'youtu.be', 'm.youtube.com']):
+            if not any(domain in url for domain in YOUTUBE_DOMAINS):
                 return create_text_result("Error: Please provide a valid YouTube URL (youtube.com or youtu.be).")
             
-            # Get the transcript
-            transcript_result = _get_youtube_transcript(url)
-            
-            # Check for error conditions
-            if any(transcript_result.startswith(prefix) for prefix in ["Error", "Invalid", "No transcript"]):
-                return create_text_result(transcript_result)
-            
-            # Extract title and transcript text  
-            lines = transcript_result.split('\n', 2)
-            title = lines[0].replace('**', '') if lines else "YouTube Video"
-            transcript_text = lines[2] if len(lines) > 2 else transcript_result
+            # Get the title and transcript (title is None when the text is an error message)
+            title, transcript_text = _get_youtube_transcript(url)
+            if title is None:
+                return create_text_result(transcript_text)
             
             # Filter out sponsor/ad content
             transcript_text = filter_sponsor_content(transcript_text)
             
-            # Calculate basic stats
-            word_count = len(transcript_text.split())
+            # Calculate basic stats (filtered text is single-space separated, so count separators
+            # instead of tokenizing the whole transcript)
+            word_count = transcript_text.count(' ') + 1 if transcript_text else 0
             duration_estimate = f"~{word_count // 150} minutes" if word_count > 150 else "< 1 minute"
             
             # Process content with adaptive truncation
@@ -119,21 +116,24 @@ def register_youtube_tools(mcp: FastMCP):
             return create_text_result(f"Error analyzing YouTube video: {str(e)}. Please check that the URL is valid and the video has available transcripts.")
 
 
-def _get_youtube_transcript(url: str) -> str:
-    """Internal function to extract transcript from YouTube video with caching"""
+def _get_youtube_transcript(url: str) -> tuple[Optional[str], str]:
+    """Internal function to extract transcript from YouTube video with caching
+    
+    Returns (title, transcript_text), or (None, error_message) on failure.
+    """
     try:
         from youtube_transcript_api import YouTubeTranscriptApi
         
         # Extract video ID
         video_id = extract_video_id(url)
         if not video_id:
-            return f"Invalid YouTube URL. Please provide a valid YouTube video URL."
+            return None, "Invalid YouTube URL. Please provide a valid YouTube video URL."
         
         # Check cache first
         cache_key = f"youtube_transcript_{video_id}"
         cached_data = get_cached_data(cache_key, "youtube_transcript")
         if cached_data:
-            return f"**{cached_data.get('title', 'YouTube Video')}**\n\n{cached_data['transcript']}"
+            return cached_data.get('title', 'YouTube Video'), cached_data['transcript']
         
         # Configure session for proxy if needed, otherwise use default
         session = create_proxy_session()
@@ -196,7 +196,7 @@ def _get_youtube_transcript(url: str) -> str:
                 error_messages.append(f"List transcripts failed: {str(e2)}")
         
         if not transcript_text:
-            return f"Error accessing video transcripts: \n{'. '.join(error_messages)}. The video may be private, age-restricted, or have no captions available."
+            return None, f"Error accessing video transcripts: \n{'. '.join(error_messages)}. The video may be private, age-restricted, or have no captions available."
         
         # Try to get video title (basic approach)
         title = f"YouTube Video ({video_id})"
@@ -211,10 +211,10 @@ def _get_youtube_transcript(url: str) -> str:
         }
         save_cached_data(cache_key, cache_data, "youtube_transcript", {'video_id': video_id})
         
-        return f"**{title}**\n\n{transcript_text}"
+        return title, transcript_text
         
     except Exception as e:
-        return f"Error processing YouTube URL: {str(e)}. Please verify the URL is correct and accessible."
+        return None, f"Error processing YouTube URL: {str(e)}. Please verify the URL is correct and accessible."
 
 
 def _process_transcript_content(transcript_text: str) -> tuple[str, str]:
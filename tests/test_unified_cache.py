@@ -0,0 +1,95 @@
+"""
+Test suite for the unified SQLite cache.
+
+Covers the housekeeping paths that run behind tool calls: expiry cleanup, its
+cross-process throttle and the max_entries size cap.
+"""
+
+import pytest
+
+from src.core.unified_cache import UnifiedCache, CacheConfig, CacheStrategy, CACHE_CONFIGS
+
+
+def _row_count(cache: UnifiedCache, tool_name: str, data_type: str) -> int:
+    """Count stored entries of one type directly"""
+    with cache._get_connection() as conn:
+        return conn.execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE tool_name = ? AND data_type = ?",
+            (tool_name, data_type)
+        ).fetchone()[0]
+
+
+def _stored_count(cache: UnifiedCache, tool_name: str, data_type: str) -> int:
+    """Row count the triggers keep in cache_meta"""
+    with cache._get_connection() as conn:
+        row = conn.execute(
+            "SELECT value FROM cache_meta WHERE key = ?", (f"rows:{tool_name}/{data_type}",)
+        ).fetchone()
+        return row[0] if row else 0
+
+
+def _expire_all(cache: UnifiedCache) -> None:
+    """Mark every stored entry as already expired"""
+    with cache._get_connection() as conn:
+        conn.execute("UPDATE cache_entries SET expires_at = 1")
+        conn.commit()
+
+
+class TestCacheCleanup:
+    """Test expiry cleanup and its throttle"""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Create a cache backed by a temporary database"""
+        return UnifiedCache(cache_dir=str(tmp_path))
+
+    def test_cleanup_throttle_is_shared_through_database(self, cache, tmp_path):
+        """Test that a cleanup in one process suppresses the next one in another"""
+
+        cache.set("first", {"value": 1})
+        _expire_all(cache)
+        assert cache.cleanup_expired_if_due(3600) == 1
+
+        # A second cache instance stands in for another MCP server process
+        other_process = UnifiedCache(cache_dir=str(tmp_path))
+        cache.set("second", {"value": 2})
+        _expire_all(cache)
+        assert other_process.cleanup_expired_if_due(3600) == 0
+        assert other_process.cleanup_expired_if_due(0) == 1
+
+
+class TestCacheSizeCap:
+    """Test the max_entries trim threshold"""
+
+    @pytest.fixture
+    def cache(self, tmp_path, monkeypatch):
+        """Create a cache with a small size-capped type"""
+        monkeypatch.setitem(
+            CACHE_CONFIGS, "capped", CacheConfig("test", "capped", CacheStrategy.PERMANENT, max_entries=20)
+        )
+        return UnifiedCache(cache_dir=str(tmp_path))
+
+    def test_trim_runs_once_type_is_a_tenth_over_cap(self, cache):
+        """Test that the cap may be overshot by max_entries // 10 rows, then trimmed"""
+
+        counts = []
+        for i in range(21):
+            cache.set(f"key_{i}", {"value": i}, "capped")
+            counts.append(_row_count(cache, "test", "capped"))
+        assert counts[-1] == 21  # Below the 22-row threshold: no trim yet
+
+        cache.set("key_21", {"value": 21}, "capped")
+        assert _row_count(cache, "test", "capped") == 20
+        assert cache.get("key_21", "capped") == {"value": 21}
+        assert max(counts) == 21
+
+    def test_stored_row_count_tracks_table(self, cache):
+        """Test that trigger-kept counts follow inserts, upserts, trims and deletes"""
+
+        for i in range(25):
+            cache.set(f"key_{i}", {"value": i}, "capped")
+        cache.set("key_24", {"value": "overwritten"}, "capped")  # Upsert, not a new row
+        assert _stored_count(cache, "test", "capped") == _row_count(cache, "test", "capped")
+
+        cache.clear_tool_cache("test")
+        assert _stored_count(cache, "test", "capped") == 0
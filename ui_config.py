@@ -75,8 +75,12 @@ With **Tools** enabled, I can:
 
 # System prompt for function calling guidance
 def get_system_prompt(current_date: str) -> str:
-    """Generate the system prompt with current date"""
-    return f"""You are a helpful AI assistant. Today's date is {current_date}. You have access to tools but should use them ONLY when absolutely necessary.
+    """Generate the system prompt with current date.
+    
+    The date is appended last so the rest of the prompt is a byte-identical prefix across days,
+    which lets the model server reuse its prompt cache.
+    """
+    return f"""You are a helpful AI assistant. You have access to tools but should use them ONLY when absolutely necessary.
 
 MEMORY SYSTEM INSTRUCTIONS:
 - You have access to a persistent memory system that stores information about the user from previous conversations
@@ -125,4 +129,6 @@ Examples - USE tools:
 - "Get Bitcoin price" → Use get_stock_overview
 - "How is NVDA doing?" → Use get_stock_overview
 - "Find papers on quantum computing" → Use arxiv_search
-- "Search for research on transformers" → Use arxiv_search"""
\ No newline at end of file
+- "Search for research on transformers" → Use arxiv_search
+
+Today's date is {current_date}."""
\ No newline at end of file